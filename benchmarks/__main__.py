@@ -0,0 +1,41 @@
+"""Run all (or selected) benchmark suites.
+
+Run with `python -m benchmarks [--json FILE] [SUITE ...]`.
+
+The JSON file contains the results of all suites together with
+the versions they were measured with, to be compared across releases.
+"""
+import argparse
+import importlib
+import json
+
+from benchmarks.common import environment, print_table
+
+SUITES = ("startup", "holidays", "fonts", "month_layout", "grid", "scaling", "render")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)} (default: all)"
+    )
+    parser.add_argument("--json", help="Write the results to a JSON file.")
+    args = parser.parse_args()
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for suite in args.suites or SUITES:
+        module = importlib.import_module(f"benchmarks.bench_{suite}")
+        results[suite] = module.collect()
+        print_table(suite, results[suite])
+        print()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({**environment(), "suites": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Looking up and registering fonts.
+
+Run with `python -m benchmarks.bench_fonts [--json FILE]`.
+
+- cold: the first get_font_name in a fresh interpreter (with the stored font index)
+- warm: get_font_name of an already registered font
+- index build: indexing all font directories from scratch
+- face parse: parsing a font file with reportlab
+- face from metrics: the same face restored from the stored metrics (see font_cache)
+"""
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+
+from reportlab.pdfbase.ttfonts import TTFontFace
+
+from benchmarks.common import Result, measure, parse_args, report, summarize
+from pyearcal import font_cache, font_index, font_loader
+
+SUITE = "fonts"
+
+FONT = "DejaVu Sans"
+
+COLD_CODE = f"""
+import time
+from pyearcal import font_loader
+start = time.perf_counter()
+font_loader.get_font_name({FONT!r})
+print(time.perf_counter() - start)
+"""
+
+
+def get_font_name_cold() -> float:
+    """Seconds of the first lookup, measured in a fresh interpreter."""
+    process = subprocess.run(
+        [sys.executable, "-c", COLD_CODE], check=True, capture_output=True, text=True
+    )
+    return float(process.stdout)
+
+
+def face_from_metrics(path: str, number: int, directory: str) -> None:
+    font_cache.clear()
+    font_cache.get_face(path, number, directory=directory)
+
+
+def collect() -> Dict[str, Result]:
+    # Make sure the index is stored before measuring cold lookups
+    font_index.get_font_index()
+    font_loader.get_font_name(FONT)
+    path, number = font_index.get_font_index().find(FONT)[font_loader.NORMAL]
+    metrics_dir = tempfile.mkdtemp(prefix="pyearcal-bench-fonts-")
+    face_from_metrics(path, number, metrics_dir)
+    return {
+        "get_font_name, cold": summarize([get_font_name_cold() for _ in range(5)]),
+        "get_font_name, warm": measure(
+            lambda: font_loader.get_font_name(FONT, font_loader.BOLD), repeat=20, number=100
+        ),
+        "font index build": measure(
+            lambda: font_index.FontIndex.build(font_index.font_directories()), repeat=3
+        ),
+        "face parse": measure(lambda: TTFontFace(path, subfontIndex=number), repeat=10),
+        "face from metrics": measure(
+            lambda: face_from_metrics(path, number, metrics_dir), repeat=10
+        ),
+    }
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    report(SUITE, collect(), args.json)
+
+
+if __name__ == "__main__":
+    main()
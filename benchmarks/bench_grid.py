@@ -0,0 +1,61 @@
+"""Drawing the day grids of all months with the table and canvas renderers.
+
+Run with `python -m benchmarks.bench_grid [--json FILE]`.
+
+Besides the time, the size of the uncompressed page content is reported.
+"""
+from io import BytesIO
+from typing import Dict
+
+from reportlab.pdfgen import canvas
+
+from benchmarks.common import Result, measure, parse_args, report
+from pyearcal.year_calendar import YearCalendar
+
+SUITE = "grid"
+
+
+def draw_grids(calendar: YearCalendar) -> int:
+    """Draw 12 pages with grids only, return the size of the PDF."""
+    output = BytesIO()
+    calendar.canvas = canvas.Canvas(output, calendar.pagesize, pageCompression=0)
+    layout = calendar._month_layout()
+    for month in range(1, 13):
+        table_data = calendar._calendar.monthdayscalendar(calendar.year, month)
+        table_data = [[day or None for day in week] for week in table_data]
+        if calendar.grid_renderer == "table":
+            table = layout.make_table(table_data, layout.make_style(calendar._day_colors(month)))
+            table.wrapOn(calendar.canvas, 7 * calendar.cell_width, 6 * calendar.cell_height)
+            table.drawOn(calendar.canvas, calendar.margins[3], calendar.margins[2])
+        else:
+            layout.draw(
+                calendar.canvas,
+                calendar.margins[3],
+                calendar.margins[2],
+                table_data,
+                calendar._day_colors(month),
+            )
+        calendar.canvas.showPage()
+    calendar.canvas.save()
+    return len(output.getvalue())
+
+
+def collect() -> Dict[str, Result]:
+    results = {}
+    for renderer in ("table", "canvas"):
+        calendar = YearCalendar(2026, grid_renderer=renderer)
+        results[f"12 grids, {renderer}"] = measure(lambda: draw_grids(calendar), repeat=10)
+        results[f"12 grids, {renderer}"]["pdf_bytes"] = draw_grids(calendar)
+    return results
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    results = collect()
+    report(SUITE, results, args.json)
+    for name, result in results.items():
+        print(f"{name}: {result['pdf_bytes']} bytes of PDF")
+
+
+if __name__ == "__main__":
+    main()
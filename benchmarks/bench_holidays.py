@@ -0,0 +1,179 @@
+"""Holidays of the locales, the baseline code vs. the compiled rule tables.
+
+Run with `python -m benchmarks.bench_holidays [--json FILE]`.
+
+The baseline is get_holidays of the Czech, Slovak and Italian locales
+before the rule tables (pyearcal 2025.12.0), copied here unchanged
+(apart from the calls of the parent class, which returned no holidays).
+The rule tables are measured without the memoization in the locales:
+evaluated per year with the years remembered by the rules ("per year")
+and by new rules each time ("per year, cold"), and for all years at once.
+get_holidays of each locale is measured both with an empty ("cold")
+and a filled ("warm") memo.
+"""
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+from dateutil.easter import easter
+
+from benchmarks.common import Result, measure, parse_args, report
+from pyearcal.l10n import default, get_locale
+from pyearcal.l10n.rules import HolidayRules, get_holiday_rules
+
+SUITE = "holidays"
+
+START_YEAR = 1900
+END_YEAR = 2100
+
+LOCALES = ("en", "cs", "sk", "it")
+
+
+def baseline_czech(year: int) -> List[date]:
+    hols: List[date] = []
+    hols.append(date(year, 1, 1))
+    hols.append(date(year, 5, 1))
+    hols.append(date(year, 5, 8))
+    hols.append(date(year, 7, 5))
+    hols.append(date(year, 7, 6))
+    hols.append(date(year, 9, 28))
+    hols.append(date(year, 10, 28))
+    hols.append(date(year, 11, 17))
+    hols.append(date(year, 12, 24))
+    hols.append(date(year, 12, 25))
+    hols.append(date(year, 12, 26))
+
+    hols.append(easter(year) + timedelta(days=1))
+    if year >= 2016:
+        hols.append(easter(year) + timedelta(days=-2))
+    return hols
+
+
+def baseline_slovak(year: int) -> List[date]:
+    hols: List[date] = []
+    hols.append(date(year, 1, 1))
+    hols.append(date(year, 1, 6))
+    hols.append(date(year, 5, 1))
+    hols.append(date(year, 5, 8))
+    hols.append(date(year, 7, 5))
+    hols.append(date(year, 8, 29))
+    hols.append(date(year, 9, 1))
+    hols.append(date(year, 9, 15))
+    hols.append(date(year, 11, 1))
+    hols.append(date(year, 11, 17))
+    hols.append(date(year, 12, 24))
+    hols.append(date(year, 12, 25))
+    hols.append(date(year, 12, 26))
+
+    hols.append(easter(year) + timedelta(days=-2))
+    hols.append(easter(year) + timedelta(days=1))
+    return hols
+
+
+def baseline_italian(year: int, city=None, province=None) -> List[date]:
+    hols: List[date] = []
+    hols.append(date(year, 1, 1))  # New Year
+    hols.append(date(year, 1, 6))  # Epiphany
+    hols.append(date(year, 4, 25))  # Liberation Day (St. Mark)
+    hols.append(date(year, 5, 1))  # Labour Day
+    hols.append(date(year, 6, 2))  # Republic Day
+    if city in ["firenze", "genova", "torino"]:
+        hols.append(date(year, 6, 24))  # St. Giovanni
+    if city == "roma":
+        hols.append(date(year, 6, 29))  # St. Peter & Paul
+    if city == "palermo":
+        hols.append(date(year, 7, 15))  # St. Rosalia
+    hols.append(date(year, 8, 15))  # Assumption of Mary
+    if city == "napoli":
+        hols.append(date(year, 9, 19))  # St. Gennaro
+    if city == "bologna":
+        hols.append(date(year, 10, 4))  # St. Petronio
+    if city == "cagliari":
+        hols.append(date(year, 10, 30))  # St. Saturnio
+    hols.append(date(year, 11, 1))  # All Saints' Day
+    if city == "trieste":
+        hols.append(date(year, 11, 3))  # St. Giusto
+    if city == "bari":
+        hols.append(date(year, 12, 6))  # St. Nicola
+    if city == "milano":
+        hols.append(date(year, 12, 7))  # St. Ambrose
+    hols.append(date(year, 12, 8))  # Immaculate Conception
+    hols.append(date(year, 12, 25))  # Christmas Day
+    hols.append(date(year, 12, 26))  # St. Stefano
+
+    # Easter (Sunday + Monday)
+    hols.append(easter(year))
+    hols.append(easter(year) + timedelta(days=1))
+    if province == "bolzano":
+        # Pentecoste (in Alto Adige / Südtirol)
+        hols.append(easter(year) + timedelta(days=50))
+    return hols
+
+
+BASELINE: Dict[str, Callable[[int], List[date]]] = {
+    "cs": baseline_czech,
+    "sk": baseline_slovak,
+    "it": baseline_italian,
+}
+
+
+def locale_rules(name: str) -> HolidayRules:
+    locale = get_locale(name)
+    assert isinstance(locale, default.DefaultLocale) and locale.holiday_rules
+    return get_holiday_rules(locale.holiday_rules, tuple(sorted(locale._region())))
+
+
+def evaluate_cold(rules: HolidayRules, years: range) -> None:
+    """Evaluate each year once by new rules (no year remembered yet)."""
+    fresh = HolidayRules(rules.rules, ("city", "province"))
+    for year in years:
+        fresh.evaluate(year)
+
+
+def get_holidays_cold(locale: default.Locale, year: int) -> None:
+    default._holiday_cache.clear()
+    locale.get_holidays(year)
+
+
+def collect() -> Dict[str, Result]:
+    years = range(START_YEAR, END_YEAR + 1)
+    results = {}
+    for name, baseline in BASELINE.items():
+        rules = locale_rules(name)
+        for year in years:
+            assert set(rules.evaluate(year)) == set(baseline(year)), (name, year)
+
+        results[f"{name} {len(years)} years, baseline"] = measure(
+            lambda: [baseline(year) for year in years], repeat=20
+        )
+        results[f"{name} {len(years)} years, rules per year"] = measure(
+            lambda: [rules.evaluate(year) for year in years], repeat=20
+        )
+        results[f"{name} {len(years)} years, rules per year, cold"] = measure(
+            lambda: evaluate_cold(rules, years), repeat=20
+        )
+        results[f"{name} {len(years)} years, rules at once"] = measure(
+            lambda: rules.evaluate_range(START_YEAR, END_YEAR), repeat=20
+        )
+    for name in LOCALES:
+        locale = get_locale(name)
+        if name in BASELINE:
+            baseline = BASELINE[name]
+            results[f"get_holidays {name}, baseline"] = measure(
+                lambda: baseline(2026), repeat=20, number=10
+            )
+        results[f"get_holidays {name}, cold"] = measure(
+            lambda: get_holidays_cold(locale, 2026), repeat=20, number=10
+        )
+        results[f"get_holidays {name}, warm"] = measure(
+            lambda: locale.get_holidays(2026), repeat=20, number=100
+        )
+    return results
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    report(SUITE, collect(), args.json)
+
+
+if __name__ == "__main__":
+    main()
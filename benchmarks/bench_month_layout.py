@@ -0,0 +1,120 @@
+"""Day grids of all months, the baseline code vs. MonthLayout.
+
+Run with `python -m benchmarks.bench_month_layout [--json FILE]`.
+
+The baseline is the table code of YearCalendar._render_month and
+_style_holidays_and_special_days before MonthLayout (pyearcal 2025.12.0),
+copied here unchanged. Both the preparation of the tables (style, layout)
+and the preparation with drawing are measured.
+"""
+from io import BytesIO
+from typing import Dict
+
+from reportlab.lib import colors
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+from benchmarks.common import Result, measure, parse_args, report
+from pyearcal import font_loader
+from pyearcal.l10n import get_locale
+from pyearcal.year_calendar import YearCalendar
+
+SUITE = "month_layout"
+
+REPEAT = 50
+
+
+def _baseline_style_days(calendar: YearCalendar, month: int, table_style: TableStyle) -> None:
+    """YearCalendar._style_holidays_and_special_days of the baseline."""
+    days_of_weeks = calendar._calendar.monthdatescalendar(calendar.year, month)
+    for row, days in enumerate(days_of_weeks):
+        for column, day in enumerate(days):
+            if day.month != month:
+                continue
+            if day.weekday() in calendar.locale.weekend:
+                table_style.add(
+                    "BACKGROUND", (column, row), (column, row), calendar.weekend_bgcolor
+                )
+                table_style.add("TEXTCOLOR", (column, row), (column, row), calendar.weekend_color)
+            if day in calendar.holidays:
+                table_style.add(
+                    "BACKGROUND", (column, row), (column, row), calendar.holiday_bgcolor
+                )
+                table_style.add("TEXTCOLOR", (column, row), (column, row), calendar.holiday_color)
+            if day in calendar.special_days:
+                table_style.add(
+                    "BACKGROUND", (column, row), (column, row), calendar.special_day_bgcolor
+                )
+                table_style.add(
+                    "TEXTCOLOR", (column, row), (column, row), calendar.special_day_color
+                )
+
+
+def baseline_table(calendar: YearCalendar, month: int) -> Table:
+    """The table of a month as built by YearCalendar._render_month of the baseline."""
+    table_data = calendar._calendar.monthdayscalendar(calendar.year, month)
+    table_data = [[day or None for day in week] for week in table_data]
+
+    table = Table(
+        table_data,
+        colWidths=(calendar.cell_width,) * 7,
+        rowHeights=(calendar.cell_height,) * len(table_data),
+    )
+
+    style = TableStyle()
+    for padding in ("TOP", "RIGHT", "BOTTOM", "LEFT"):
+        style.add(padding + "PADDING", (0, 0), (-1, -1), calendar.cell_padding)
+    for position in ("BEFORE", "AFTER", "ABOVE", "BELOW"):
+        style.add("LINE" + position, (0, 0), (-1, -1), calendar.cell_spacing / 2, colors.white)
+
+    font_name = font_loader.get_font_name(calendar.cell_font_name, calendar.cell_font_variant)
+    style.add("FONT", (0, 0), (-1, -1), font_name, calendar.cell_font_size)
+    style.add("ALIGN", (0, 0), (-1, -1), "RIGHT")
+    style.add("VALIGN", (0, 0), (-1, -1), "MIDDLE")
+    style.add("BACKGROUND", (0, 0), (-1, -1), calendar.week_bgcolor)
+    style.add("TEXTCOLOR", (0, 0), (-1, -1), calendar.week_color)
+
+    _baseline_style_days(calendar, month, style)
+
+    table.setStyle(style)
+    return table
+
+
+def month_layout_table(calendar: YearCalendar, month: int) -> Table:
+    """The table of a month as built by YearCalendar._render_month now."""
+    table_data = calendar._calendar.monthdayscalendar(calendar.year, month)
+    table_data = [[day or None for day in week] for week in table_data]
+    layout = calendar._month_layout()
+    style = layout.make_style(calendar._day_colors(month))
+    return layout.make_table(table_data, style)
+
+
+def grids(calendar: YearCalendar, make_table, draw: bool) -> None:
+    for month in range(1, 13):
+        table = make_table(calendar, month)
+        table.wrapOn(calendar.canvas, 7 * calendar.cell_width, 6 * calendar.cell_height)
+        if draw:
+            table.drawOn(calendar.canvas, calendar.margins[3], calendar.margins[2])
+
+
+def collect() -> Dict[str, Result]:
+    calendar = YearCalendar(2026, locale=get_locale("cs"))
+    calendar.canvas = canvas.Canvas(BytesIO(), calendar.pagesize)
+    results = {}
+    for draw, label in ((False, "prepared"), (True, "prepared and drawn")):
+        results[f"12 grids {label}, baseline"] = measure(
+            lambda: grids(calendar, baseline_table, draw), repeat=REPEAT
+        )
+        results[f"12 grids {label}, MonthLayout"] = measure(
+            lambda: grids(calendar, month_layout_table, draw), repeat=REPEAT
+        )
+    return results
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    report(SUITE, collect(), args.json)
+
+
+if __name__ == "__main__":
+    main()
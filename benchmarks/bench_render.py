@@ -0,0 +1,67 @@
+"""Rendering of a whole calendar with synthetic 3000x2000 pictures.
+
+Run with `python -m benchmarks.bench_render [--json FILE]`.
+
+The PDF is written to memory, the size of it is reported as well.
+Calendars of several years are rendered one by one and as a MultiCalendar.
+"""
+from io import BytesIO
+from typing import Dict
+
+from benchmarks.common import Result, measure, parse_args, report
+from benchmarks.fixtures import picture_directory
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.multi_calendar import CalendarVariant, MultiCalendar
+from pyearcal.year_calendar import YearCalendar
+
+SUITE = "render"
+
+SOURCE_SIZE = (3000, 2000)
+DPIS = (72, 150)
+VARIANT_YEARS = (2026, 2027, 2028)
+
+
+def render(calendar: YearCalendar) -> int:
+    output = BytesIO()
+    calendar.render(output)
+    return len(output.getvalue())
+
+
+def render_variants(calendars: MultiCalendar) -> int:
+    outputs = [BytesIO() for _ in calendars.calendars]
+    calendars.render(outputs)
+    return sum(len(output.getvalue()) for output in outputs)
+
+
+def collect() -> Dict[str, Result]:
+    pictures = SortedImageDirectory(picture_directory(SOURCE_SIZE))
+    results = {}
+    for dpi in DPIS:
+        calendar = YearCalendar(2026, pictures, image_dpi=dpi)
+        name = f"calendar {dpi} dpi"
+        results[name] = measure(lambda: render(calendar), repeat=3)
+        results[name]["pdf_bytes"] = render(calendar)
+
+    calendars = [YearCalendar(year, pictures, image_dpi=DPIS[0]) for year in VARIANT_YEARS]
+    name = f"{len(calendars)} years one by one"
+    results[name] = measure(lambda: sum(map(render, calendars)), repeat=3)
+    results[name]["pdf_bytes"] = sum(map(render, calendars))
+    multi = MultiCalendar(
+        [CalendarVariant(year) for year in VARIANT_YEARS], pictures, image_dpi=DPIS[0]
+    )
+    name = f"{len(calendars)} years as MultiCalendar"
+    results[name] = measure(lambda: render_variants(multi), repeat=3)
+    results[name]["pdf_bytes"] = render_variants(multi)
+    return results
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    results = collect()
+    report(SUITE, results, args.json)
+    for name, result in results.items():
+        print(f"{name}: {result['pdf_bytes']} bytes of PDF")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Scaling of single pictures by both algorithms at several resolutions.
+
+Run with `python -m benchmarks.bench_scaling [--json FILE]`.
+
+Each round opens the picture again (so that JPEG draft mode applies)
+and scales it for the page of January.
+"""
+from typing import Dict, Tuple
+
+import PIL.Image
+
+from benchmarks.common import Result, measure, parse_args, report
+from benchmarks.fixtures import picture_path
+from pyearcal.year_calendar import YearCalendar
+
+SUITE = "scaling"
+
+SOURCE_SIZES = ((3000, 2000), (6000, 4000))
+DPIS = (150, 300)
+SCALINGS = ("squarecrop", "smartcrop", "fit")
+
+
+def scale(calendar: YearCalendar, path: str) -> Tuple[int, int]:
+    with PIL.Image.open(path) as image:
+        scaled = calendar._scale_picture(image, calendar._picture_height(1))[0]
+    return scaled.size
+
+
+def collect() -> Dict[str, Result]:
+    results = {}
+    for size in SOURCE_SIZES:
+        path = picture_path(size)
+        for scaling in SCALINGS:
+            for dpi in DPIS:
+                calendar = YearCalendar(2026, scaling=scaling, image_dpi=dpi)
+                results[f"{size[0]}x{size[1]} {scaling} {dpi} dpi"] = measure(
+                    lambda: scale(calendar, path), repeat=5
+                )
+    return results
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    report(SUITE, collect(), args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cold start of the command line interface.
+
+Run with `python -m benchmarks.bench_startup [--json FILE]`.
+
+Fails if `pyearcal --help` is slower than the target
+or if importing the CLI pulls in any of the heavy modules.
+"""
+import subprocess
+import sys
+from typing import Dict
+
+from benchmarks.common import Result, measure, parse_args, report, summarize
+
+SUITE = "startup"
+
+# Seconds for `pyearcal --help` in a fresh interpreter
+TARGET_SECONDS = 0.3
+
+# Modules that must not be imported before rendering
+HEAVY_MODULES = ("PIL", "reportlab", "matplotlib", "fontTools", "numpy")
+
+
+def run_cli_help() -> None:
+    subprocess.run(
+        [sys.executable, "-m", "pyearcal.cli", "--help"], check=True, stdout=subprocess.DEVNULL
+    )
+
+
+def import_time_us(module: str) -> int:
+    """Cumulative import time of a module in a fresh interpreter (`-X importtime`)."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for line in reversed(process.stderr.splitlines()):
+        _, _, cumulative, name = [part.strip() for part in line.replace(":", "|", 1).split("|")]
+        if name == module:
+            return int(cumulative)
+    raise RuntimeError(f"Import time of {module} not reported.")
+
+
+def imported_heavy_modules(module: str) -> list[str]:
+    code = f"import sys, {module}; print(*(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return process.stdout.split()
+
+
+def collect() -> Dict[str, Result]:
+    return {
+        "cli --help": measure(run_cli_help, repeat=5),
+        "import pyearcal.cli": summarize([import_time_us("pyearcal.cli") / 1e6 for _ in range(5)]),
+    }
+
+
+def main() -> int:
+    args = parse_args(__doc__)
+    results = collect()
+    report(SUITE, results, args.json)
+
+    failed = False
+    if results["cli --help"]["min"] > TARGET_SECONDS:
+        print(f"FAILED: `pyearcal --help` slower than {TARGET_SECONDS} s")
+        failed = True
+    heavy = imported_heavy_modules("pyearcal.cli")
+    if heavy:
+        print(f"FAILED: importing pyearcal.cli imports {', '.join(heavy)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
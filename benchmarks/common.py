@@ -0,0 +1,69 @@
+"""Helpers shared by the benchmarks."""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional
+
+Result = Dict[str, float]
+
+
+def measure(func: Callable[[], object], *, repeat: int = 5, number: int = 1) -> Result:
+    """Time a function (in seconds per call).
+
+    :param repeat: Number of rounds
+    :param number: Number of calls in each round
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return summarize(times)
+
+
+def summarize(times: List[float]) -> Result:
+    """Statistics of measured times (in seconds)."""
+    return {
+        "min": min(times),
+        "mean": statistics.mean(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": len(times),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """What the results depend on besides the code (stored with them)."""
+    try:
+        version = metadata.version("pyearcal")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {"pyearcal": version, "python": sys.version.split()[0], "machine": platform.machine()}
+
+
+def print_table(suite: str, results: Dict[str, Result]) -> None:
+    width = max(len(name) for name in results)
+    print(f"{suite:<{width}}  {'min [ms]':>10}  {'mean [ms]':>10}  {'stddev':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<{width}}  {result['min'] * 1000:>10.2f}  "
+            f"{result['mean'] * 1000:>10.2f}  {result['stddev'] * 1000:>8.2f}"
+        )
+
+
+def report(suite: str, results: Dict[str, Result], json_path: Optional[str] = None) -> None:
+    """Print the results as a table and optionally store them as JSON."""
+    print_table(suite, results)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"suite": suite, **environment(), "results": results}, f, indent=2)
+
+
+def parse_args(description: Optional[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--json", help="Write the results to a JSON file.")
+    return parser.parse_args()
@@ -0,0 +1,53 @@
+"""Deterministic pictures for the benchmarks, generated offline.
+
+The pictures are built only from Pillow's own generators (gradients
+and the Mandelbrot set), so the same version of Pillow always produces
+the same files. They are stored in a temporary directory and reused
+by subsequent runs.
+"""
+import os
+import tempfile
+from typing import Tuple
+
+from PIL import Image
+
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), "pyearcal-bench-fixtures")
+
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png"}
+
+
+def make_picture(size: Tuple[int, int], seed: int = 0) -> Image.Image:
+    """Synthetic RGB picture with smooth areas and fine detail, like a photo.
+
+    :param seed: Shifts the fractal, so that each month gets a different picture
+    """
+    width, height = size
+    extent = (-2.0 + seed * 0.02, -1.2, 0.8 + seed * 0.02, 1.2)
+    detail = Image.effect_mandelbrot((width, height), extent, 64)
+    horizontal = Image.linear_gradient("L").rotate(90).resize(size)
+    radial = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", (horizontal, radial, detail))
+
+
+def picture_directory(size: Tuple[int, int], format: str = "JPEG") -> str:
+    """Directory with 12 pictures (1.jpg ... 12.jpg, see SortedImageDirectory).
+
+    Created on the first use.
+    """
+    extension = EXTENSIONS[format]
+    directory = os.path.join(FIXTURE_DIR, f"{size[0]}x{size[1]}-{extension}")
+    paths = [os.path.join(directory, f"{month}.{extension}") for month in range(1, 13)]
+    if not all(os.path.exists(path) for path in paths):
+        os.makedirs(directory, exist_ok=True)
+        for month, path in enumerate(paths, start=1):
+            # Written under a temporary name, so that an interrupted run is not reused
+            temp_path = f"{path}.tmp"
+            make_picture(size, month).save(temp_path, format=format, quality=90)
+            os.replace(temp_path, path)
+    return directory
+
+
+def picture_path(size: Tuple[int, int], format: str = "JPEG") -> str:
+    """Path to a single picture of a given size."""
+    directory = picture_directory(size, format)
+    return os.path.join(directory, f"1.{EXTENSIONS[format]}")
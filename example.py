@@ -4,16 +4,12 @@ from pyearcal.year_calendar import YearCalendar
 from datetime import date
 from pyearcal.l10n import DefaultLocale
 from pyearcal.flickr_downloader import FlickrDownloader
-from pyearcal.image_sources import SortedImageDirectory
-import os
 
 year = date.today().year + 1
 
-if os.path.exists(".flickr-download"):
-    image_source = SortedImageDirectory(".flickr-download")
-else:
-    # Download a few pictures from a nice region of Ladakh
-    image_source = FlickrDownloader("python")
+# Download a few pictures from a nice region of Ladakh
+# (pictures downloaded before are reused)
+image_source = FlickrDownloader("python")
 
 # Use default locale and holidays
 locale = DefaultLocale()
@@ -0,0 +1,16 @@
+"""Year calendar creation in Python.
+
+The heavy modules (reportlab, PIL) are imported only when YearCalendar
+is first accessed, so that e.g. the command line starts quickly.
+"""
+from typing import Any
+
+__all__ = ["YearCalendar"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "YearCalendar":
+        from .year_calendar import YearCalendar
+
+        return YearCalendar
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
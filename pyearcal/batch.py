@@ -0,0 +1,165 @@
+"""batch module
+
+Render many calendars from one process.
+
+Each calendar is described by a job - a dictionary with the same options
+as the command line. A manifest is a JSON lines file with one job per line:
+
+    {"output": "alice.pdf", "source": "photos/alice", "locale": "cs", "year": 2026}
+    {"output": "bob.pdf", "source": "photos/bob", "special_days": ["2026-01-31"]}
+
+Jobs are rendered in a pool of worker processes. Each worker registers
+the fonts and creates the locales only once. Pictures are prepared by each
+job on its own, unless a cache directory is given: then scaled pictures
+are shared between all jobs and workers via an ImageCache (which does
+not change the output, see there).
+"""
+import functools
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional
+
+from pyearcal import font_loader
+from pyearcal.cache import ImageCache
+from pyearcal.cli import load_special_days
+from pyearcal.image_sources import ImageSource, SortedImageDirectory, UnsortedImageDirectory
+from pyearcal.l10n import Locale, get_locale
+from pyearcal.year_calendar import YearCalendar
+
+JOB_OPTIONS = (
+    "output",
+    "source",
+    "sorted",
+    "locale",
+    "year",
+    "font",
+    "special_days",
+    "image_dpi",
+    "scaling",
+    "grid_renderer",
+    "cache_dir",
+)
+
+
+class JobResult(NamedTuple):
+    """Outcome of a single job."""
+
+    output: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_locale(name: str) -> Locale:
+    return get_locale(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_image_cache(directory: str) -> ImageCache:
+    return ImageCache(directory)
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Read jobs from a JSON lines file (empty lines are skipped)."""
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_calendar(job: Mapping[str, Any]) -> YearCalendar:
+    """Create a calendar from the job options (see JOB_OPTIONS).
+
+    Special days are either a path to a file in the format
+    of load_special_days or a list of ISO dates.
+    """
+    unknown = set(job) - set(JOB_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown job options: {', '.join(sorted(unknown))}")
+
+    year = job.get("year", date.today().year + 1)
+    source = job.get("source", ".")
+    if job.get("sorted", False):
+        image_source: ImageSource = SortedImageDirectory(source)
+    else:
+        image_source = UnsortedImageDirectory(source)
+    # Fail early, before any rendering
+    image_source.validate()
+
+    kwargs: Dict[str, Any] = {"image_dpi": job.get("image_dpi", 300)}
+    if job.get("scaling"):
+        kwargs["scaling"] = job["scaling"]
+    if job.get("grid_renderer"):
+        kwargs["grid_renderer"] = job["grid_renderer"]
+    if job.get("font"):
+        kwargs["title_font_name"] = job["font"]
+        kwargs["cell_font_name"] = job["font"]
+    if job.get("cache_dir"):
+        kwargs["image_cache"] = _get_image_cache(job["cache_dir"])
+    special_days = job.get("special_days")
+    if isinstance(special_days, str):
+        kwargs["special_days"] = load_special_days(special_days, year)
+    elif special_days:
+        kwargs["special_days"] = [date.fromisoformat(day) for day in special_days]
+
+    return YearCalendar(year, image_source, locale=_get_locale(job.get("locale", "en")), **kwargs)
+
+
+def render_job(job: Mapping[str, Any], workers: Optional[int] = None) -> JobResult:
+    """Render one job, reporting failure instead of raising it.
+
+    :param workers: Number of threads preparing the pictures (see YearCalendar.render)
+    """
+    output = str(job.get("output", ""))
+    start = time.perf_counter()
+    try:
+        if not output:
+            raise ValueError("Job without output.")
+        build_calendar(job).render(output, workers=workers)
+    except Exception as exc:
+        logging.warning(f"Rendering of '{output}' failed: {exc}")
+        return JobResult(output, time.perf_counter() - start, f"{type(exc).__name__}: {exc}")
+    return JobResult(output, time.perf_counter() - start)
+
+
+def _init_worker() -> None:
+    """Register the default fonts once per worker."""
+    for variant in (font_loader.NORMAL, font_loader.BOLD):
+        try:
+            font_loader.get_font_name("DejaVu Sans", variant)
+        except font_loader.FontNotFound:
+            pass
+
+
+def render_batch(
+    jobs: Iterable[Mapping[str, Any]],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> Iterator[JobResult]:
+    """Render all jobs, yielding the results as they finish.
+
+    :param workers: Number of worker processes (default: number of CPUs, 1 => in this process)
+    :param cache_dir: Directory for scaled pictures shared by the jobs
+        (default: None => no cache, each job scales its pictures)
+    """
+    workers = workers or os.cpu_count() or 1
+    if cache_dir:
+        jobs = [{"cache_dir": cache_dir, **job} for job in jobs]
+
+    if workers == 1:
+        _init_worker()
+        for job in jobs:
+            yield render_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures: Dict[Future, str] = {
+            executor.submit(render_job, job): str(job.get("output", "")) for job in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as exc:  # e.g. a crashed worker
+                yield JobResult(futures[future], 0.0, f"{type(exc).__name__}: {exc}")
@@ -0,0 +1,170 @@
+"""cache module
+
+Persistent caches that make repeated renders of similar calendars cheaper.
+
+ImageCache stores scaled pictures as (lossless) PNG files, so a re-render
+with unchanged pictures decodes only the small scaled pictures instead of
+the full-size sources, and embeds exactly the same pixels as without cache.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import PIL.Image
+
+
+def default_cache_dir() -> str:
+    """Default directory for pyearcal caches (respects XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pyearcal")
+
+
+class ImageCache(object):
+    """Content-addressed on-disk cache of scaled pictures.
+
+    Keys are computed from the contents of the source file and all
+    parameters that influence the scaling. Values are PNG files
+    kept in a single directory.
+
+    The total size of the directory is bounded by max_size, the least
+    recently used entries are evicted first (down to EVICT_TO of max_size,
+    so that there is room for further entries). The directory is scanned
+    only when the size known from the last scan plus the size of the
+    files stored since exceeds max_size. (Files stored by other
+    processes count only after the next scan.)
+    """
+
+    EXTENSION = ".png"
+
+    # Image modes that PNG stores without any conversion
+    MODES = ("RGB", "RGBA", "L", "LA", "P", "1")
+
+    # Fraction of max_size the cache is reduced to when it exceeds max_size
+    EVICT_TO = 0.75
+
+    # Number of file versions whose digests are remembered
+    DIGEST_CACHE_SIZE = 4096
+
+    # (path, size, mtime) => digest of the file contents (shared by all instances),
+    # least recently used first
+    _digests: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+    _digests_lock = threading.Lock()
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = 512 * 1024**2):
+        """
+        :param directory: Where to store the files (default: see default_cache_dir)
+        :param max_size: Maximum total size of the stored files in bytes
+        """
+        self.directory = directory or os.path.join(default_cache_dir(), "images")
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # Total size of the files (None until the directory is scanned)
+        self._size: Optional[int] = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file_digest(self, path: str) -> bytes:
+        """Hash of the file contents, computed once per file version."""
+        stat = os.stat(path)
+        identity = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+        with self._digests_lock:
+            digest = self._digests.get(identity)
+            if digest is not None:
+                self._digests.move_to_end(identity)
+                return digest
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").digest()
+        with self._digests_lock:
+            self._digests[identity] = digest
+            while len(self._digests) > self.DIGEST_CACHE_SIZE:
+                self._digests.popitem(last=False)
+        return digest
+
+    def make_key(self, source_path: str, **params: Any) -> str:
+        """Key for a scaled version of a file.
+
+        :param source_path: Path to the original picture
+        :param params: Everything else that influences the result
+        """
+        h = hashlib.sha256(self._file_digest(source_path))
+        for name in sorted(params):
+            h.update(f"{name}={params[name]!r};".encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def get(self, key: str) -> Optional[PIL.Image.Image]:
+        """Find a cached picture.
+
+        Return PIL image (loaded) or None if not cached.
+        """
+        path = self._path(key)
+        try:
+            image = PIL.Image.open(path, formats=["PNG"])
+            image.load()
+            os.utime(path)  # Mark as recently used
+        except OSError:  # incl. PIL.UnidentifiedImageError
+            return None
+        logging.debug(f"Picture {key} found in cache.")
+        return image
+
+    def put(self, key: str, image) -> Optional[str]:
+        """Store a scaled picture.
+
+        :param image: PIL image
+        :returns: Path to the stored file or None if the image cannot be stored as PNG
+            without conversion (e.g. CMYK).
+        """
+        if image.mode not in self.MODES:
+            return None
+        path = self._path(key)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # Fast compression, the files are temporary anyway
+                image.save(f, format="PNG", compress_level=1)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+                if self._size <= self.max_size:
+                    return path
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        """Delete least recently used entries if the cache exceeds max_size.
+
+        Entries are deleted until the cache fits in EVICT_TO of max_size.
+        """
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.EXTENSION):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total_size = sum(size for _, size, _ in entries)
+            target_size = (
+                self.max_size * self.EVICT_TO if total_size > self.max_size else total_size
+            )
+            for _, size, path in sorted(entries):
+                if total_size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                    logging.debug(f"Evicted {path} from cache.")
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+            self._size = total_size
@@ -1,18 +1,11 @@
 #!/usr/bin/env python
 from datetime import date
 import logging
-from typing import Any, Optional
+import sys
+from typing import List, Optional, Tuple
 
 import click
 
-from pyearcal.year_calendar import YearCalendar
-from pyearcal.l10n import get_locale
-from pyearcal.image_sources import (
-    ImageSource,
-    UnsortedImageDirectory,
-    SortedImageDirectory,
-)
-
 
 def load_special_days(path, year):
     """Load special days from external file.
@@ -27,9 +20,52 @@ def load_special_days(path, year):
         return days
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """Group of commands that falls back to a default one.
+
+    This keeps `pyearcal [OPTIONS] [OUTPUT]` working next to named commands.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+    def format_options(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List the options of the default command too (they work without its name)."""
+        super().format_options(ctx, formatter)
+        command = self.commands[self.default_command]
+        command_ctx = click.Context(command, info_name=self.default_command, parent=ctx)
+        records = [
+            record
+            for param in command.params
+            if (record := param.get_help_record(command_ctx)) is not None
+        ]
+        with formatter.section(f"Options of {self.default_command} (the default command)"):
+            formatter.write_dl(records)
+
+
+def setup_logging(verbose: int) -> None:
+    if verbose == 1:
+        logging.basicConfig(level=logging.INFO)
+    elif verbose == 2:
+        logging.basicConfig(level=logging.DEBUG)
+    elif verbose:
+        logging.warning("Invalid verbosity level (available: 0..2)")
+
+
+@click.group(cls=DefaultCommandGroup, default_command="render")
+def run():
+    """Generate year calendars (`render` is the default command, used without COMMAND)."""
+
+
+@run.command()
 @click.argument("output", default="calendar.pdf")
-@click.option("-s", "--source", type=click.Path(), default=".")
+@click.option("-s", "--source", type=click.Path(exists=True, file_okay=False), default=".")
 @click.option(
     "-l",
     "--locale",
@@ -39,11 +75,48 @@ def load_special_days(path, year):
 )
 @click.option("-y", "--year", default=date.today().year + 1, type=int)
 @click.option("-f", "--font", type=str)
-@click.option("-d", "--special-days", type=str)
+@click.option("-d", "--special-days", type=click.Path(exists=True, dir_okay=False))
 @click.option("--image-dpi", default=300, type=int)
 @click.option("--sorted/--unsorted", default=False)
+@click.option(
+    "--scaling",
+    type=click.Choice(["squarecrop", "smartcrop", "fit"]),
+    default="squarecrop",
+    help="How the pictures are fitted in their area.",
+)
+@click.option(
+    "--grid-renderer",
+    type=click.Choice(["table", "canvas"]),
+    default="table",
+    help="How the grid of days is drawn.",
+)
+@click.option("-j", "--jobs", default=1, type=int, help="Number of pictures prepared in parallel.")
+@click.option(
+    "--cache-dir", type=click.Path(file_okay=False), help="Directory to cache scaled pictures in."
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Reuse unchanged pictures of the previous rendering of OUTPUT.",
+)
+@click.option(
+    "--draft",
+    is_flag=True,
+    help="Render a quick draft (pictures at low resolution, standard fonts).",
+)
+@click.option(
+    "--proofs",
+    is_flag=True,
+    help="Write PNG proofs of the pages into OUTPUT (a directory) instead of a PDF.",
+)
+@click.option("--profile", is_flag=True, help="Print timings of the rendering stages.")
+@click.option(
+    "--profile-json",
+    type=click.Path(dir_okay=False),
+    help="Write timings of the rendering stages to a JSON file.",
+)
 @click.option("-v", "--verbose", count=True)
-def run(
+def render(
     output: str,
     source: str,
     locale_name: str,
@@ -53,31 +126,136 @@ def run(
     sorted: bool,
     verbose: int,
     image_dpi: int,
+    scaling: str,
+    grid_renderer: str,
+    jobs: int,
+    cache_dir: Optional[str],
+    incremental: bool,
+    draft: bool,
+    proofs: bool,
+    profile: bool,
+    profile_json: Optional[str],
 ):
-    """Generate year calendar."""
-    if verbose:
-        if verbose == 1:
-            logging.basicConfig(level=logging.INFO)
-        if verbose == 2:
-            logging.basicConfig(level=logging.DEBUG)
-        else:
-            logging.warn("Invalid verbosity level (available: 0..2)")
+    """Generate year calendar (OUTPUT "-" writes the PDF to stdout)."""
+    from pyearcal.batch import build_calendar
+
+    setup_logging(verbose)
+    try:
+        calendar = build_calendar(
+            {
+                "source": source,
+                "sorted": sorted,
+                "locale": locale_name,
+                "year": year,
+                "font": font,
+                "special_days": special_days,
+                "image_dpi": image_dpi,
+                "scaling": scaling,
+                "grid_renderer": grid_renderer,
+                "cache_dir": cache_dir,
+            }
+        )
+    except FileNotFoundError as exc:
+        # Pictures missing in the source directory
+        raise click.BadParameter(str(exc), param_hint="'-s' / '--source'") from exc
+    if proofs:
+        from pyearcal.preview import save_proofs
+
+        if output == "-":
+            raise click.UsageError("--proofs needs OUTPUT to be a directory.")
+        save_proofs(calendar, output, workers=jobs)
+        return
+    if draft:
+        from pyearcal.preview import draft_calendar
 
-    if sorted:
-        image_source: ImageSource = SortedImageDirectory(source)
+        calendar = draft_calendar(calendar)
+    # The peak memory of the rendering alone (logged) is measured only when profiling
+    calendar.measure_peak_memory = profile or bool(profile_json)
+    if output == "-":
+        if incremental:
+            raise click.UsageError("--incremental needs OUTPUT to be a file.")
+        calendar.render(sys.stdout.buffer, workers=jobs)
+    elif incremental:
+        calendar.render_incremental(output, workers=jobs)
     else:
-        image_source = UnsortedImageDirectory(source)
-    locale = get_locale(locale_name)
-    kwargs: dict[str, Any] = {
-        "image_dpi": image_dpi,
-    }
-    if font:
-        kwargs["title_font_name"] = font
-        kwargs["cell_font_name"] = font
-    if special_days:
-        kwargs["special_days"] = load_special_days(special_days, year)
-    calendar = YearCalendar(year, image_source, locale=locale, **kwargs)
-    calendar.render(output)
+        calendar.render(output, workers=jobs)
+    if profile:
+        # stdout may contain the calendar itself
+        click.echo(calendar.profile.summary(), err=True)
+    if profile_json:
+        calendar.profile.save_json(profile_json)
+
+
+@run.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("-j", "--jobs", type=int, help="Number of calendars rendered in parallel.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Directory to cache scaled pictures shared by the jobs in (default: no cache).",
+)
+@click.option("-v", "--verbose", count=True)
+def batch(manifest: str, jobs: Optional[int], cache_dir: Optional[str], verbose: int):
+    """Render calendars described in a JSON lines manifest (one job per line)."""
+    from pyearcal.batch import load_manifest, render_batch
+
+    setup_logging(verbose)
+    failed = 0
+    for result in render_batch(load_manifest(manifest), workers=jobs, cache_dir=cache_dir):
+        if result.error:
+            failed += 1
+            click.echo(f"FAILED {result.output} ({result.seconds:.2f} s): {result.error}", err=True)
+        else:
+            click.echo(f"{result.output} ({result.seconds:.2f} s)")
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+@run.command()
+@click.option("--host", default="127.0.0.1", help="Address to listen on.")
+@click.option("-p", "--port", default=8080, type=int)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Unix socket to listen on (instead of host and port).",
+)
+@click.option("-j", "--jobs", type=int, help="Number of calendars rendered in parallel.")
+@click.option(
+    "--queue-size", default=16, type=int, help="Number of requests that can wait for a worker."
+)
+@click.option(
+    "--cache-dir", type=click.Path(file_okay=False), help="Directory to cache scaled pictures in."
+)
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory that job sources must be in (repeatable, default: current directory).",
+)
+@click.option("-v", "--verbose", count=True)
+def serve(
+    host: str,
+    port: int,
+    socket_path: Optional[str],
+    jobs: Optional[int],
+    queue_size: int,
+    cache_dir: Optional[str],
+    roots: Tuple[str, ...],
+    verbose: int,
+):
+    """Render calendars over HTTP (POST a batch job as JSON to /render)."""
+    import asyncio
+
+    from pyearcal.server import RenderServer
+
+    setup_logging(verbose)
+    server = RenderServer(workers=jobs, queue_size=queue_size, cache_dir=cache_dir, roots=roots)
+    try:
+        asyncio.run(server.serve(host, port, socket_path))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
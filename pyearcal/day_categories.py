@@ -0,0 +1,65 @@
+"""day_categories module
+
+Compact classification of all days of a year (weekend, holiday, special day).
+"""
+from datetime import date
+from typing import Iterable
+
+# Bit flags of the categories
+WEEKEND = 1
+HOLIDAY = 2
+SPECIAL_DAY = 4
+
+
+class DayCategories(object):
+    """Categories of all days in a year, stored as bit flags (one byte per day).
+
+    The collections of holidays and special days (which can be long and slow
+    to search) are read only once, each day is then classified in O(1).
+    Days outside the year have no categories.
+    """
+
+    def __init__(
+        self,
+        year: int,
+        weekend: Iterable[int] = (),
+        holidays: Iterable[date] = (),
+        special_days: Iterable[date] = (),
+    ):
+        """
+        :param weekend: Weekdays (0 = Monday) of the weekend
+        """
+        self.year = year
+        self._first_ordinal = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - self._first_ordinal
+        self._flags = bytearray(length)
+
+        first_weekday = date(year, 1, 1).weekday()
+        for weekday in set(weekend):
+            for index in range((weekday - first_weekday) % 7, length, 7):
+                self._flags[index] |= WEEKEND
+        for day in holidays:
+            self._add(day, HOLIDAY)
+        for day in special_days:
+            self._add(day, SPECIAL_DAY)
+
+    def _add(self, day: date, flag: int) -> None:
+        index = day.toordinal() - self._first_ordinal
+        if 0 <= index < len(self._flags):
+            self._flags[index] |= flag
+
+    def __getitem__(self, day: date) -> int:
+        """Flags of a day (0 if it is in no category)."""
+        index = day.toordinal() - self._first_ordinal
+        if 0 <= index < len(self._flags):
+            return self._flags[index]
+        return 0
+
+    def is_weekend(self, day: date) -> bool:
+        return bool(self[day] & WEEKEND)
+
+    def is_holiday(self, day: date) -> bool:
+        return bool(self[day] & HOLIDAY)
+
+    def is_special_day(self, day: date) -> bool:
+        return bool(self[day] & SPECIAL_DAY)
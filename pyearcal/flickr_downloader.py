@@ -1,51 +1,203 @@
-import requests
-import random
+import logging
 import os
-from .image_sources import SortedImageDirectory
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+import PIL.Image
+import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .image_sources import MONTHS, SortedImageDirectory
 
 TEMP_DIR = ".flickr-download"
 EXTENSION = ".jpg"
 
+FEED_URL = "https://api.flickr.com/services/feeds/photos_public.gne"
+
+# (connect, read) in seconds
+TIMEOUT = (5, 30)
+
+CHUNK_SIZE = 64 * 1024
+
+# Seconds to wait before the first retry, doubled for each next one
+BACKOFF = 0.5
+
+# Failures of a download that are worth trying again. A connection
+# broken while reading the body is not retried by the session.
+RETRIED_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ValueError,  # incomplete picture
+)
+
+
+def is_valid_image(path: str) -> bool:
+    """Whether the file exists and is a complete, readable image."""
+    try:
+        with PIL.Image.open(path) as image:
+            image.verify()
+        return True
+    except (OSError, SyntaxError):  # PIL reports some broken files as SyntaxError
+        return False
+
 
 class FlickrDownloader(SortedImageDirectory):
     """Image source that downloads random pictures from Flickr.
 
+    Pictures are downloaded in parallel through one session
+    (connections are reused), with timeouts and retries of failed requests
+    and interrupted downloads. A picture that cannot be downloaded is
+    skipped and listed in failed, the others are kept. Valid pictures
+    downloaded before are kept, only missing or broken ones are
+    downloaded again (see refresh).
+
     Based on the article
         http://blog.art21.org/2011/09/20/how-to-use-python-to-create-a-simple-flickr-photo-glitcher
     """
 
-    def download_images(self, number: int = 12) -> None:
-        response = requests.get(
-            "https://api.flickr.com/services/feeds/photos_public.gne?tags="
-            + self.keyword
-            + "&lang=en-us&format=rss_200"
-        )
-        soup = BeautifulSoup(response.content, "lxml")
-
-        image_list = []
-        for image in soup.findAll("media:content"):
-            image_url = dict(image.attrs)["url"]
-            image_list.append(image_url)
-        image_list = random.sample(image_list, number)
-
-        if not os.path.isdir(TEMP_DIR):
-            os.makedirs(TEMP_DIR)
-        for index, image in enumerate(image_list):
-            response = requests.get(image)
-            with open(
-                os.path.join(TEMP_DIR, f"{index + 1}{EXTENSION}"), "wb"
-            ) as output_file:
-                output_file.write(response.content)
-            response.close()
-            print(f"Downloaded picture {index + 1} of {number} from flickr.")
-
-    def __init__(self, keyword: str = "python"):
+    def __init__(
+        self,
+        keyword: str = "python",
+        *,
+        dirname: str = TEMP_DIR,
+        feed_url: str = FEED_URL,
+        workers: int = 4,
+        retries: int = 3,
+        timeout: Tuple[float, float] = TIMEOUT,
+        refresh: bool = False,
+    ):
         """
         :param keyword: a keyword to look for on flickr.
+        :param dirname: where the pictures are stored (as 1.jpg ... 12.jpg)
+        :param feed_url: RSS feed with the pictures (e.g. a local stand-in for testing)
+        :param workers: number of pictures downloaded at the same time
+        :param retries: number of retries of each failed request and download
+        :param timeout: (connect, read) timeout of each request in seconds
+        :param refresh: if True, download all pictures again
         """
+        super().__init__(dirname, EXTENSION)
         self.keyword = keyword
-        self.dirname = TEMP_DIR
-        self.extension = EXTENSION
+        self.feed_url = feed_url
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.failed: List[int] = []
+        self.session = self._make_session(retries)
+        if refresh:
+            self._remove_images()
         self.download_images()
-        self.read_images()
+
+    def _make_session(self, retries: int) -> requests.Session:
+        retry = Retry(
+            total=retries,
+            backoff_factor=BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_maxsize=self.workers, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _remove_images(self) -> None:
+        for index in MONTHS:
+            if os.path.exists(self._resolve(index)):
+                os.remove(self._resolve(index))
+
+    def fetch_image_urls(self) -> List[str]:
+        """URLs of all pictures in the feed for the keyword."""
+        response = self.session.get(
+            self.feed_url,
+            params={"tags": self.keyword, "lang": "en-us", "format": "rss_200"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        soup = BeautifulSoup(response.content, "lxml")
+        return [str(image["url"]) for image in soup.find_all("media:content")]
+
+    def download_image(self, url: str, path: str) -> None:
+        """Download one picture, streamed to disk.
+
+        The picture is written under a temporary name first,
+        so that an interrupted download never looks complete.
+        The temporary file is removed if the download fails.
+        """
+        temp_path = f"{path}.part"
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(temp_path, "wb") as output_file:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        output_file.write(chunk)
+            if not is_valid_image(temp_path):
+                raise ValueError(f"Downloaded file is not a valid image: {url}")
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _download_with_retries(self, url: str, path: str) -> Optional[Exception]:
+        """Download one picture, trying again after errors in RETRIED_ERRORS.
+
+        :returns: The last error if all attempts failed
+        """
+        error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(BACKOFF * 2 ** (attempt - 1))
+            try:
+                self.download_image(url, path)
+                return None
+            except RETRIED_ERRORS as exc:
+                logging.debug(f"Download of {url} failed (attempt {attempt + 1}): {exc}")
+                error = exc
+        return error
+
+    def download_images(self, number: int = 12) -> None:
+        """Download the pictures that are missing (or broken).
+
+        Pictures that fail to download are logged and their months are
+        in failed (they are missing until the next call).
+        """
+        missing = [
+            index for index in range(1, number + 1) if not is_valid_image(self._resolve(index))
+        ]
+        self.failed = []
+        if not missing:
+            logging.info(f"All {number} pictures from flickr already downloaded.")
+            return
+
+        image_list = random.sample(self.fetch_image_urls(), len(missing))
+        os.makedirs(self.dirname, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            urls = dict(zip(missing, image_list, strict=True))
+            futures = {
+                executor.submit(self._download_with_retries, url, self._resolve(index)): index
+                for index, url in urls.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                error = future.result()
+                if error:
+                    self.failed.append(index)
+                    logging.warning(
+                        f"Picture {index} could not be downloaded from {urls[index]}: {error}"
+                    )
+                else:
+                    logging.info(
+                        f"Downloaded picture {index} ({done} of {len(missing)}) from flickr."
+                    )
+        if self.failed:
+            self.failed.sort()
+            logging.warning(
+                f"{len(self.failed)} of {len(missing)} pictures from flickr are missing."
+            )
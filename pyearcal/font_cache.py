@@ -0,0 +1,155 @@
+"""font_cache module
+
+Shared cache of parsed TrueType fonts.
+
+Parsing a font file (cmap, glyph metrics, ...) takes tens of milliseconds.
+Parsed faces are therefore kept for the whole process (one face is shared
+by all names a file is registered under) and their metrics are stored
+pickled in the cache directory, so that a new process only reads the raw
+font data (needed for subsetting) instead of parsing it again.
+
+Fonts are embedded into PDFs as subsets of the glyphs actually used
+(reportlab does that for all TTFont instances).
+
+CachedTTFont and the stored metrics reproduce internals of reportlab's
+TTFont and TTFontFace. With other reportlab versions than REPORTLAB_VERSIONS,
+plain TTFont instances are created instead (parsed every time).
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from fnmatch import fnmatch
+from typing import Any, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+
+CACHE_VERSION = 1
+
+# Prefixes of the reportlab versions whose font internals are reproduced here
+REPORTLAB_VERSIONS = ("4.", "5.0.")
+
+# Attributes of a face that are not stored (the raw data is read from the font file)
+_TRANSIENT = ("_ttf_data", "_pdfScale", "_pos")
+
+# (real path, subfont index, size, mtime) => parsed face
+_faces: Dict[Tuple[str, int, int, int], TTFontFace] = {}
+_lock = threading.Lock()
+
+
+def default_font_cache_dir() -> str:
+    from .cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "fonts")
+
+
+class CachedTTFont(TTFont):
+    """TTFont using an already parsed (shared) face."""
+
+    def __init__(self, name: str, face: TTFontFace, asciiReadable: Optional[bool] = None):
+        # Same as TTFont.__init__, only without parsing the file
+        self.fontName = name
+        self.face = face
+        self.encoding = TTEncoding()
+        self.state: WeakKeyDictionary = WeakKeyDictionary()
+        if asciiReadable is None:
+            asciiReadable = rl_config.ttfAsciiReadable
+        self._asciiReadable = asciiReadable
+        self.shapable = not any(fnmatch(name, glob) for glob in rl_config.unShapedFontGlob)
+
+
+def is_supported() -> bool:
+    """Whether fonts of the installed reportlab version can be cached."""
+    return reportlab.Version.startswith(REPORTLAB_VERSIONS)
+
+
+def _pdf_scale(units_per_em: int):
+    """Conversion of font units to PDF units (as set by TTFontFile.extractInfo)."""
+    if units_per_em == 1000:
+        return lambda x: x
+    multiplier = 1000 / units_per_em
+    return lambda x: x * multiplier
+
+
+def _metrics_path(directory: str, identity: Tuple[str, int, int, int]) -> str:
+    h = hashlib.sha256(f"{CACHE_VERSION};{reportlab.Version};{identity!r}".encode("utf-8"))
+    return os.path.join(directory, h.hexdigest() + ".pickle")
+
+
+def _load_metrics(path: str, font_path: str) -> Optional[TTFontFace]:
+    try:
+        with open(path, "rb") as f:
+            state: Dict[str, Any] = pickle.load(f)
+        with open(font_path, "rb") as f:
+            data = f.read()
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state)
+    face._ttf_data = data
+    face._pdfScale = _pdf_scale(face.unitsPerEm)
+    face._pos = 0
+    return face
+
+
+def _save_metrics(path: str, face: TTFontFace) -> None:
+    state = {key: value for key, value in vars(face).items() if key not in _TRANSIENT}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def get_face(path: str, subfont_index: int = 0, directory: Optional[str] = None) -> TTFontFace:
+    """Parsed face of a font file, from the cache if possible.
+
+    :param path: The font file
+    :param subfont_index: Number of the font in a collection (.ttc)
+    :param directory: Where the metrics are stored (default: in the cache directory)
+    """
+    stat = os.stat(path)
+    identity = (os.path.realpath(path), subfont_index, stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        face = _faces.get(identity)
+        if face is not None:
+            return face
+
+        metrics_path = _metrics_path(directory or default_font_cache_dir(), identity)
+        face = _load_metrics(metrics_path, path)
+        if face is None:
+            face = TTFontFace(path, subfontIndex=subfont_index)
+            try:
+                _save_metrics(metrics_path, face)
+            except OSError as exc:
+                logging.warning(f"Cannot store font metrics to {metrics_path}: {exc}")
+        else:
+            logging.debug(f"Font metrics of {path} loaded from {metrics_path}")
+        _faces[identity] = face
+        return face
+
+
+def make_font(name: str, path: str, subfont_index: int = 0) -> TTFont:
+    """A font to register in pdfmetrics, sharing the parsed face with other fonts.
+
+    With an unsupported reportlab version (see is_supported), the font
+    is a plain TTFont parsing the file.
+
+    :param name: The registered name of the font
+    :param path: The font file
+    :param subfont_index: Number of the font in a collection (.ttc)
+    """
+    if not is_supported():
+        logging.debug(f"Fonts of reportlab {reportlab.Version} are not cached.")
+        return TTFont(name, path, subfontIndex=subfont_index)
+    return CachedTTFont(name, get_face(path, subfont_index))
+
+
+def clear() -> None:
+    """Forget the faces parsed in this process (the stored metrics are kept)."""
+    with _lock:
+        _faces.clear()
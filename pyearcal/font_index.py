@@ -0,0 +1,229 @@
+"""font_index module
+
+Persistent index of installed fonts (family => variant => file).
+
+Building the index means reading the name tables of all font files
+in the font directories, which is slow. The index is therefore stored
+in the cache directory and reused as long as none of the indexed
+directories has changed (compared by their modification times).
+Loading a fresh index takes only a few milliseconds.
+"""
+import importlib.util
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Define font variant names
+BOLD = "bold"
+ITALIC = "italic"
+BOLD_ITALIC = "boldItalic"
+NORMAL = "normal"
+
+# Extensions of the files to index (compared case-insensitively)
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+INDEX_VERSION = 1
+
+# (path, font number in a collection)
+FontFile = Tuple[str, int]
+
+
+def font_directories() -> List[str]:
+    """Existing root directories with fonts on this system.
+
+    This includes the fonts bundled with matplotlib (found without importing it).
+    """
+    candidates = []
+    if os.name == "posix":
+        candidates += ["/usr/share/fonts", "~/.fonts", "~/.local/share/fonts"]
+    if os.name == "nt":
+        candidates.append(os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"))
+    mpl_spec = importlib.util.find_spec("matplotlib")
+    if mpl_spec and mpl_spec.submodule_search_locations:
+        for location in mpl_spec.submodule_search_locations:
+            candidates.append(os.path.join(location, "mpl-data", "fonts", "ttf"))
+    directories = [os.path.expanduser(candidate) for candidate in candidates]
+    return [directory for directory in directories if os.path.isdir(directory)]
+
+
+def default_index_path() -> str:
+    from .cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "fonts.json")
+
+
+def _read_font_entries(path: str) -> List[Tuple[str, str, int, FontFile]]:
+    """Read the family and variant of all fonts in a file.
+
+    Only fonts with TrueType outlines are returned (reportlab cannot embed CFF).
+
+    :returns: List of (family, variant, score, font file) where lower score
+        means a more regular width and weight for the variant.
+    """
+    from fontTools.ttLib import TTCollection, TTFont
+
+    if path.lower().endswith(".ttc"):
+        fonts = TTCollection(path, lazy=True).fonts
+    else:
+        fonts = [TTFont(path, lazy=True)]
+
+    entries = []
+    for number, font in enumerate(fonts):
+        if "glyf" not in font:
+            continue
+        family = font["name"].getBestFamilyName()
+        if not family:
+            continue
+        mac_style = font["head"].macStyle
+        weight, width, italic_selection = 400, 5, False
+        if "OS/2" in font:
+            os2 = font["OS/2"]
+            weight, width = os2.usWeightClass, os2.usWidthClass
+            italic_selection = bool(os2.fsSelection & 1)
+        is_bold = bool(mac_style & 1) or weight >= 600
+        is_italic = bool(mac_style & 2) or italic_selection
+
+        if is_bold and is_italic:
+            variant = BOLD_ITALIC
+        elif is_bold:
+            variant = BOLD
+        elif is_italic:
+            variant = ITALIC
+        else:
+            variant = NORMAL
+        score = abs(width - 5) * 1000 + abs(weight - (700 if is_bold else 400))
+        entries.append((family, variant, score, (path, number)))
+    return entries
+
+
+class FontIndex(object):
+    """Mapping of font families to files with their variants."""
+
+    def __init__(
+        self, fonts: Dict[str, Dict[str, FontFile]], directories: Dict[str, int], roots: List[str]
+    ):
+        """
+        :param fonts: family => variant => (path, font number)
+        :param directories: All indexed directories => their mtime (ns)
+        :param roots: The root directories the index was built from
+        """
+        self.fonts = fonts
+        self.directories = directories
+        self.roots = roots
+
+    def find(self, family: str) -> Dict[str, FontFile]:
+        """All variants of a family (empty if not found)."""
+        return self.fonts.get(family, {})
+
+    def is_fresh(self, roots: List[str]) -> bool:
+        """Whether no indexed directory changed since building the index."""
+        if sorted(roots) != sorted(self.roots):
+            return False
+        try:
+            return all(
+                os.stat(directory).st_mtime_ns == mtime
+                for directory, mtime in self.directories.items()
+            )
+        except OSError:
+            return False
+
+    @classmethod
+    def build(cls, roots: List[str]) -> "FontIndex":
+        """Walk the directories and read all font files."""
+        fonts: Dict[str, Dict[str, FontFile]] = {}
+        scores: Dict[Tuple[str, str], int] = {}
+        directories: Dict[str, int] = {}
+
+        # fontTools complains loudly about harmless issues in many fonts
+        fonttools_logger = logging.getLogger("fontTools")
+        fonttools_level = fonttools_logger.level
+        fonttools_logger.setLevel(logging.ERROR)
+        try:
+            cls._walk(roots, fonts, scores, directories)
+        finally:
+            fonttools_logger.setLevel(fonttools_level)
+
+        logging.info(f"Indexed {len(fonts)} font families in {len(directories)} directories.")
+        return cls(fonts, directories, list(roots))
+
+    @staticmethod
+    def _walk(
+        roots: List[str],
+        fonts: Dict[str, Dict[str, FontFile]],
+        scores: Dict[Tuple[str, str], int],
+        directories: Dict[str, int],
+    ) -> None:
+        for root in roots:
+            for current, _, files in os.walk(root):
+                directories[current] = os.stat(current).st_mtime_ns
+                for file_name in sorted(files):
+                    if not file_name.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(current, file_name)
+                    try:
+                        entries = _read_font_entries(path)
+                    except Exception as exc:
+                        logging.debug(f"Cannot index font file {path}: {exc}")
+                        continue
+                    for family, variant, score, font_file in entries:
+                        if scores.get((family, variant), score + 1) > score:
+                            scores[family, variant] = score
+                            fonts.setdefault(family, {})[variant] = font_file
+
+    @classmethod
+    def load(cls, path: str) -> Optional["FontIndex"]:
+        """Read a stored index (None if missing or incompatible)."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        fonts = {
+            family: {variant: (file, number) for variant, (file, number) in variants.items()}
+            for family, variants in data["fonts"].items()
+        }
+        return cls(fonts, data["directories"], data["roots"])
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "roots": self.roots,
+                    "directories": self.directories,
+                    "fonts": self.fonts,
+                },
+                f,
+            )
+        os.replace(temp_path, path)
+
+
+_index: Optional[FontIndex] = None
+
+
+def get_font_index(path: Optional[str] = None, rebuild: bool = False) -> FontIndex:
+    """The font index of this system, loaded or built once per process.
+
+    :param path: Where the index is stored (default: in the cache directory)
+    :param rebuild: If True, the index is built again even if it is fresh.
+    """
+    global _index
+    if _index is not None and not rebuild and path is None:
+        return _index
+
+    roots = font_directories()
+    path = path or default_index_path()
+    index = None if rebuild else FontIndex.load(path)
+    if index is None or not index.is_fresh(roots):
+        index = FontIndex.build(roots)
+        try:
+            index.save(path)
+        except OSError as exc:
+            logging.warning(f"Cannot store font index to {path}: {exc}")
+    _index = index
+    return index
@@ -2,21 +2,83 @@ import abc
 import os
 import fnmatch
 import random
-from typing import Dict, Iterator, Iterable
-from collections import OrderedDict
+import threading
+from typing import Dict, Iterator, Iterable, List, Protocol
 
+MONTHS = range(1, 13)
 
-class ImageSource(abc.ABC, Iterable[str]):
-    """Base class for image sources."""
+
+class Pictures(Protocol):
+    """Paths to the pictures of months, indexed 1..12 (e.g. an ImageSource)."""
 
     def __getitem__(self, index: int) -> str:
-        return self.images[index]
+        ...
+
+    def __iter__(self) -> Iterator[str]:
+        ...
+
+
+class ImageSource(abc.ABC, Iterable[str]):
+    """Base class for image sources.
+
+    The picture of each month (1..12) is resolved lazily on its first
+    access (see _resolve) and remembered in images. Nothing is checked
+    up front, call validate to check all pictures at once.
+
+    Subclasses that do not call __init__ (and e.g. fill images
+    themselves) work as well.
+    """
 
     images: Dict[int, str]
 
+    # Guards creating the state of instances whose __init__ was not called
+    _state_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.images = {}
+        self._lock = threading.Lock()
+
+    def _get_lock(self) -> threading.Lock:
+        """Lock of this instance, created on the first use if __init__ was not called."""
+        lock = getattr(self, "_lock", None)
+        if lock is None:
+            with ImageSource._state_lock:
+                lock = getattr(self, "_lock", None)
+                if lock is None:
+                    if not hasattr(self, "images"):
+                        self.images = {}
+                    lock = self._lock = threading.Lock()
+        return lock
+
+    def _resolve(self, index: int) -> str:
+        """Path to the picture of a month (implement in subclasses)."""
+        raise KeyError(index)
+
+    def __getitem__(self, index: int) -> str:
+        # Pictures are requested from worker threads when rendering
+        with self._get_lock():
+            if index not in self.images:
+                self.images[index] = self._resolve(index)
+            return self.images[index]
+
     def __iter__(self) -> Iterator[str]:
-        for image in self.images.values():
-            yield image
+        for index in MONTHS:
+            yield self[index]
+
+    def read_images(self) -> None:
+        """Resolve the pictures of all months now."""
+        for index in MONTHS:
+            self[index]
+
+    def validate(self) -> None:
+        """Check that the pictures of all months exist.
+
+        :raises FileNotFoundError: Listing all missing files.
+        """
+        self.read_images()
+        missing = [path for path in self.images.values() if not os.path.isfile(path)]
+        if missing:
+            raise FileNotFoundError(f"Files do not exist: {', '.join(missing)}")
 
 
 class SortedImageDirectory(ImageSource):
@@ -27,36 +89,49 @@ class SortedImageDirectory(ImageSource):
     """
 
     def __init__(self, dirname=".", extension=".jpg"):
+        super().__init__()
         self.dirname = dirname
         self.extension = extension
-        self.read_images()
 
-    def read_images(self) -> None:
-        self.images = OrderedDict()
-        for index in range(1, 13):
-            path = os.path.join(self.dirname, str(index) + self.extension)
-            if os.path.exists(path):
-                self.images[index] = path
-            else:
-                raise Exception(f"File does not exist: {path}")
+    def _resolve(self, index: int) -> str:
+        return os.path.join(self.dirname, str(index) + self.extension)
 
 
 class UnsortedImageDirectory(ImageSource):
-    """Image directory with images in random order."""
+    """Image directory with images in random order.
+
+    On the first access, 12 images are sampled uniformly while scanning
+    the directory once (reservoir sampling), so even huge directories
+    are never listed in memory as a whole.
+    """
 
     def __init__(self, dirname=".", pattern="*.jpg"):
+        super().__init__()
         self.dirname = dirname
         self.pattern = pattern
-        self.read_images()
 
-    def read_images(self):
-        self.images = OrderedDict()
-        all_file_names = [
-            fn for fn in os.listdir(self.dirname) if fnmatch.fnmatch(fn, self.pattern)
-        ]
-        if len(all_file_names) < 12:
-            raise ValueError(f"Not enough images in directory: {len(all_file_names)}")
-        sampled_file_names = random.sample(all_file_names, 12)
-
-        for index, name in enumerate(sampled_file_names):
-            self.images[index + 1] = os.path.join(self.dirname, name)
+    def _sample(self, number: int) -> List[str]:
+        sample: List[str] = []
+        count = 0
+        with os.scandir(self.dirname) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, self.pattern) or not entry.is_file():
+                    continue
+                if count < number:
+                    sample.append(entry.path)
+                else:
+                    replaced = random.randrange(count + 1)
+                    if replaced < number:
+                        sample[replaced] = entry.path
+                count += 1
+        if count < number:
+            raise ValueError(f"Not enough images in directory: {count}")
+        # The order of the first entries in the reservoir is not random
+        random.shuffle(sample)
+        return sample
+
+    def _resolve(self, index: int) -> str:
+        # All months are sampled together (called with the lock held)
+        if not self.images:
+            self.images.update(zip(MONTHS, self._sample(len(MONTHS)), strict=True))
+        return self.images[index]
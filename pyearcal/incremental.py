@@ -0,0 +1,267 @@
+"""incremental module
+
+Re-rendering of a calendar that reuses the pictures of the previous rendering.
+
+Each page has a fingerprint of everything it is drawn from: the picture
+file (path, size, modification time) and its scaling, the days of the month
+with their categories, the fonts, colours and geometry. The picture alone
+has a fingerprint of its own, so that e.g. a new special day does not
+require scaling the picture of its month again.
+
+The fingerprints are stored in a manifest next to the PDF (see manifest_path)
+together with the location of each picture in the PDF. When nothing changed,
+the PDF is not written at all. Otherwise, all pages are drawn again (the grid
+and the title are cheap), but the pictures with unchanged fingerprints are
+copied from the previous PDF as compressed image streams, without decoding,
+scaling and compressing them again. (reportlab cannot read existing PDFs,
+so the pages themselves cannot be copied.) With invariant output
+(see YearCalendar), the result is byte-identical to a full rendering.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+from . import font_loader
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(pdf_path: str) -> str:
+    return f"{pdf_path}.manifest.json"
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _file_identity(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _pyearcal_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("pyearcal")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _font_identity(name: str, variant: str) -> Tuple[str, Optional[str]]:
+    """Registered name and file of a font."""
+    registered_name = font_loader.get_font_name(name, variant)
+    face = getattr(pdfmetrics.getFont(registered_name), "face", None)
+    return registered_name, getattr(face, "filename", None)
+
+
+def picture_fingerprint(calendar, month: int) -> str:
+    """Fingerprint of the picture of a month as embedded in the PDF."""
+    return _digest(
+        _file_identity(calendar.pictures[month]),
+        calendar.scaling,
+        calendar.image_dpi,
+        calendar.resample,
+        calendar.content_width,
+        calendar._picture_height(month),
+        rl_config.useA85,
+        reportlab.Version,
+        _pyearcal_version(),
+    )
+
+
+def page_fingerprints(calendar) -> Dict[int, Tuple[str, str]]:
+    """(page fingerprint, picture fingerprint) of all months of a calendar."""
+    document = (
+        calendar.pagesize,
+        calendar.margins,
+        calendar.invariant,
+        calendar.locale.calendar_name,
+        calendar.year,
+    )
+    grid = (
+        calendar.grid_renderer,
+        calendar.max_table_height,
+        _font_identity(calendar.cell_font_name, calendar.cell_font_variant),
+        calendar.cell_font_size,
+        calendar.cell_padding,
+        calendar.cell_spacing,
+        *(
+            repr(color)
+            for color in (
+                calendar.week_color,
+                calendar.week_bgcolor,
+                calendar.weekend_color,
+                calendar.weekend_bgcolor,
+                calendar.holiday_color,
+                calendar.holiday_bgcolor,
+                calendar.special_day_color,
+                calendar.special_day_bgcolor,
+            )
+        ),
+    )
+    title = (
+        _font_identity(calendar.title_font_name, calendar.title_font_variant),
+        calendar.title_font_size,
+        calendar.title_margin,
+    )
+    day_categories = calendar.day_categories
+    fingerprints = {}
+    for month in range(1, 13):
+        weeks = calendar._calendar.monthdatescalendar(calendar.year, month)
+        days = [
+            [(day.day, day_categories[day]) if day.month == month else None for day in week]
+            for week in weeks
+        ]
+        picture = picture_fingerprint(calendar, month)
+        page = _digest(
+            picture,
+            document,
+            grid,
+            title,
+            days,
+            calendar.locale.get_month_title(
+                calendar.year, month, calendar.include_year_in_month_name
+            ),
+        )
+        fingerprints[month] = page, picture
+    return fingerprints
+
+
+def image_entry(xobject: PDFImageXObject, number: int) -> Optional[Dict[str, Any]]:
+    """Description of an image stored in the PDF as object number (None if not reusable)."""
+    if xobject.mask or getattr(xobject, "smask", None) or getattr(xobject, "_smask", None):
+        return None
+    return {
+        "object": number,
+        "name": xobject.name,
+        "width": xobject.width,
+        "height": xobject.height,
+        "bits": xobject.bitsPerComponent,
+        "color_space": xobject.colorSpace,
+        "filters": list(xobject._filters),
+        "decode": getattr(xobject, "_decode", None),
+        "dotrans": bool(getattr(xobject, "_dotrans", 0)),
+        "length": len(xobject.streamContent),
+    }
+
+
+def object_offsets(pdf_data: bytes) -> Dict[int, int]:
+    """Object number => offset in the file (from the cross-reference table)."""
+    match = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", pdf_data)
+    if not match:
+        return {}
+    lines = iter(pdf_data[int(match.group(1)) :].splitlines())
+    if next(lines, b"").strip() != b"xref":
+        return {}
+    offsets = {}
+    number = 0
+    for line in lines:
+        fields = line.split()
+        if len(fields) == 2:  # subsection: first number, count
+            number = int(fields[0])
+        elif len(fields) == 3:
+            if fields[2] == b"n":
+                offsets[number] = int(fields[0])
+            number += 1
+        else:
+            break
+    return offsets
+
+
+def read_image(
+    pdf_data: bytes, offsets: Dict[int, int], entry: Dict[str, Any]
+) -> Optional[PDFImageXObject]:
+    """Image stored in a PDF as described by image_entry (None if not found)."""
+    offset = offsets.get(entry["object"])
+    if offset is None or not pdf_data.startswith(b"%d 0 obj" % entry["object"], offset):
+        return None
+    start = pdf_data.find(b"\nstream\n", offset) + len(b"\nstream\n")
+    end = start + entry["length"]
+    if not pdf_data.startswith(b"endstream", end):
+        return None
+    xobject = PDFImageXObject(entry["name"])
+    xobject.width = entry["width"]
+    xobject.height = entry["height"]
+    xobject.bitsPerComponent = entry["bits"]
+    xobject.colorSpace = entry["color_space"]
+    xobject._filters = tuple(entry["filters"])
+    if entry["decode"]:
+        xobject._decode = entry["decode"]
+    if entry["dotrans"]:
+        xobject._dotrans = 1
+    xobject.streamContent = pdf_data[start:end]
+    return xobject
+
+
+class PageEntry(NamedTuple):
+    fingerprint: str
+    picture_fingerprint: str
+    picture_size: Tuple[float, float]  # in points
+    image: Optional[Dict[str, Any]]  # see image_entry
+
+
+class RenderManifest(object):
+    """Fingerprints of the pages of a rendered PDF and where its pictures are."""
+
+    def __init__(self, pdf_size: int, pdf_sha256: str, pages: Dict[int, PageEntry]):
+        self.pdf_size = pdf_size
+        self.pdf_sha256 = pdf_sha256
+        self.pages = pages
+
+    @classmethod
+    def load(cls, pdf_path: str) -> Tuple[Optional["RenderManifest"], bytes]:
+        """The manifest of a PDF and the PDF contents.
+
+        The manifest is None if missing, incompatible or if the PDF
+        has changed since (then the contents are empty as well).
+        """
+        try:
+            with open(manifest_path(pdf_path), "r") as f:
+                data = json.load(f)
+            with open(pdf_path, "rb") as f:
+                pdf_data = f.read()
+        except (OSError, ValueError):
+            return None, b""
+        if data.get("version") != MANIFEST_VERSION:
+            return None, b""
+        if (len(pdf_data), hashlib.sha256(pdf_data).hexdigest()) != (
+            data["pdf_size"],
+            data["pdf_sha256"],
+        ):
+            logging.info(f"{pdf_path} changed since it was rendered, rendering it again.")
+            return None, b""
+        pages = {
+            int(month): PageEntry(
+                page["fingerprint"],
+                page["picture_fingerprint"],
+                tuple(page["picture_size"]),
+                page["image"],
+            )
+            for month, page in data["pages"].items()
+        }
+        return cls(data["pdf_size"], data["pdf_sha256"], pages), pdf_data
+
+    def save(self, pdf_path: str) -> None:
+        path = manifest_path(pdf_path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "pdf_size": self.pdf_size,
+                    "pdf_sha256": self.pdf_sha256,
+                    "pages": {str(month): page._asdict() for month, page in self.pages.items()},
+                },
+                f,
+                indent=1,
+            )
+        os.replace(temp_path, path)
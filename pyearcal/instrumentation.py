@@ -0,0 +1,105 @@
+"""instrumentation module
+
+Timing of the rendering stages of a calendar.
+
+Each stage is measured per month (None for stages of the whole document)
+and reported to the hooks as it finishes. Stages of YearCalendar.render:
+
+- "decode" : Opening the picture and decoding its pixels
+- "crop" : Choosing the crop box by the content (smartcrop scaling only)
+- "scale" : Cropping and resampling the picture
+- "cache" : Looking up and storing the picture in the image cache
+- "embed" : Converting the picture for the PDF and drawing it (compression)
+- "grid" : Layout and drawing of the day grid
+- "title" : Drawing the month title
+- "save" : Writing the whole document
+
+Stages of different months can overlap when pictures are prepared
+in parallel, their sum can be therefore larger than the total time.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+STAGES = ("decode", "crop", "scale", "cache", "embed", "grid", "title", "save")
+
+# hook(stage, month, seconds)
+StageHook = Callable[[str, Optional[int], float], None]
+
+
+class RenderProfile(object):
+    """Timings of stages and counters (bytes written, pixels) of one rendering."""
+
+    def __init__(self, hooks: Iterable[StageHook] = ()):
+        """
+        :param hooks: Callables invoked after each finished stage
+        """
+        self.hooks = list(hooks)
+        # stage => month => seconds
+        self.timings: Dict[str, Dict[Optional[int], float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str, month: Optional[int] = None) -> Iterator[None]:
+        """Measure the duration of the block (even when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, month)
+
+    def add(self, stage: str, seconds: float, month: Optional[int] = None) -> None:
+        with self._lock:
+            months = self.timings.setdefault(stage, {})
+            months[month] = months.get(month, 0.0) + seconds
+        for hook in self.hooks:
+            hook(stage, month, seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def stage_total(self, stage: str) -> float:
+        return sum(self.timings.get(stage, {}).values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form (months as strings, "all" for the whole document)."""
+        return {
+            "total": self.total,
+            "stages": {
+                stage: {
+                    "total": self.stage_total(stage),
+                    "months": {
+                        "all" if month is None else str(month): seconds
+                        for month, seconds in sorted(months.items(), key=lambda item: item[0] or 0)
+                    },
+                }
+                for stage, months in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def summary(self) -> str:
+        """Table of the stages with their total, mean and slowest month."""
+        lines = [f"{'stage':<8}  {'total [ms]':>10}  {'mean [ms]':>10}  {'max [ms]':>10}  month"]
+        known = [stage for stage in STAGES if stage in self.timings]
+        for stage in known + sorted(set(self.timings) - set(known)):
+            months = self.timings[stage]
+            slowest = max(months, key=months.__getitem__)
+            lines.append(
+                f"{stage:<8}  {sum(months.values()) * 1000:>10.1f}  "
+                f"{sum(months.values()) / len(months) * 1000:>10.1f}  "
+                f"{months[slowest] * 1000:>10.1f}  {'-' if slowest is None else slowest}"
+            )
+        lines.append(f"{'total':<8}  {self.total * 1000:>10.1f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
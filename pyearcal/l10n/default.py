@@ -1,6 +1,10 @@
 import calendar
+import threading
+from collections import OrderedDict
 from datetime import date
-from typing import Collection, Protocol, Tuple
+from typing import Collection, Dict, FrozenSet, List, Mapping, Optional, Protocol, Tuple
+
+from .rules import Region, get_holiday_rules
 
 
 class Locale(Protocol):
@@ -12,39 +16,65 @@ class Locale(Protocol):
     def first_day_of_week(self) -> int:
         ...
 
-    def get_month_title(self, year: int, month: int) -> str:
+    @property
+    def weekend(self) -> Collection[int]:
+        ...
+
+    def get_month_title(self, year: int, month: int, include_year: bool = False) -> str:
         ...
 
     def get_holidays(self, year: int) -> Collection[date]:
         ...
 
+    def get_holidays_range(self, start_year: int, end_year: int) -> Mapping[int, Collection[date]]:
+        ...
+
     @property
     def calendar_name(self) -> str:
         ...
 
 
+MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+WEEKEND = (calendar.SATURDAY, calendar.SUNDAY)
+
+
+# Memoized holidays: (locale, year) => holidays, least recently used first.
+# Locales with the same type and region compare equal (see DefaultLocale.__eq__).
+_HOLIDAY_CACHE_SIZE = 1024
+_holiday_cache: "OrderedDict[Tuple[DefaultLocale, int], FrozenSet[date]]" = OrderedDict()
+_holiday_cache_lock = threading.Lock()
+
+
 class DefaultLocale(Locale):
     """Default calendar.
 
     In english language, Sunday as first day, no holidays.
+
+    Holidays are generated from the rules in holidays.json named by
+    holiday_rules (see rules module) and memoized per locale type,
+    region and year. Override _compute_holidays_range for other sources.
     """
 
+    # Key of the locale in holidays.json
+    holiday_rules: Optional[str] = None
+
     @property
     def month_names(self) -> Tuple[str, ...]:
-        return (
-            "January",
-            "February",
-            "March",
-            "April",
-            "May",
-            "June",
-            "July",
-            "August",
-            "September",
-            "October",
-            "November",
-            "December",
-        )
+        return MONTH_NAMES
 
     def get_month_title(self, year: int, month: int, include_year: bool = False) -> str:
         if include_year:
@@ -58,10 +88,55 @@ class DefaultLocale(Locale):
 
     @property
     def weekend(self) -> Collection[int]:
-        return (calendar.SATURDAY, calendar.SUNDAY)
+        return WEEKEND
 
-    def get_holidays(self, year: int) -> Collection[date]:
-        return []
+    def _region(self) -> Region:
+        """Everything besides the type of locale that influences the holidays.
+
+        Rules in holidays.json can be limited to values of these keys.
+        """
+        return {}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._region() == other._region()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash((type(self), tuple(sorted(self._region().items()))))
+
+    def _compute_holidays_range(self, start_year: int, end_year: int) -> Dict[int, List[date]]:
+        """Holidays of all years in the range (both inclusive), without memoization."""
+        if self.holiday_rules is None:
+            return {year: [] for year in range(start_year, end_year + 1)}
+        region = self._region()
+        rules = get_holiday_rules(self.holiday_rules, tuple(sorted(region)))
+        return rules.evaluate_range(start_year, end_year, region)
+
+    def get_holidays(self, year: int) -> FrozenSet[date]:
+        return self.get_holidays_range(year, year)[year]
+
+    def get_holidays_range(self, start_year: int, end_year: int) -> Dict[int, FrozenSet[date]]:
+        """Holidays for all years from start_year to end_year (both inclusive).
+
+        Years that are not memoized yet are computed together.
+        """
+        result: Dict[int, FrozenSet[date]] = {}
+        with _holiday_cache_lock:
+            for year in range(start_year, end_year + 1):
+                holidays = _holiday_cache.get((self, year))
+                if holidays is not None:
+                    _holiday_cache.move_to_end((self, year))
+                    result[year] = holidays
+        missing = [year for year in range(start_year, end_year + 1) if year not in result]
+        if missing:
+            computed = self._compute_holidays_range(missing[0], missing[-1])
+            with _holiday_cache_lock:
+                for year in missing:
+                    result[year] = _holiday_cache[self, year] = frozenset(computed[year])
+                while len(_holiday_cache) > _HOLIDAY_CACHE_SIZE:
+                    _holiday_cache.popitem(last=False)
+        return {year: result[year] for year in range(start_year, end_year + 1)}
 
     @property
     def calendar_name(self) -> str:
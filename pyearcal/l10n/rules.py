@@ -0,0 +1,201 @@
+"""Declarative holiday rules.
+
+Holidays of the locales are described in holidays.json as lists of rules
+(one rule per holiday). Each rule has a "name" and exactly one of:
+
+- "date": "MM-DD" - a fixed date
+- "easter": N - N days after (or before, if negative) Easter Sunday
+- "month", "weekday", "nth" - n-th weekday (0 = Monday) in a month,
+  1 to 4 or -4 to -1 counting from the end of the month (-1 = last)
+
+Optionally, the rule can be limited to years ("from", "to", both inclusive)
+and to regions of the locale (e.g. "city": ["roma", "milano"]). The keys
+of the regions are given by the locale (see DefaultLocale._region),
+rules with any other keys are rejected.
+
+The rules are compiled once for each region and evaluated for many
+years at once (see HolidayRules.evaluate_range). Evaluated years
+are remembered.
+"""
+import calendar
+import functools
+import json
+from datetime import date, timedelta
+from importlib import resources
+from typing import Any, Collection, Dict, List, Mapping, Optional, Tuple
+
+from dateutil.easter import easter
+
+# Keys describing the date of a holiday (one of the kinds) and all keys of rules
+DATE_KEYS = {"date", "easter", "month", "weekday", "nth"}
+RULE_KEYS = {"name", "from", "to"} | DATE_KEYS
+
+MIN_YEAR = 1
+MAX_YEAR = 9999
+
+# Region is a mapping like {"city": "roma", "province": None}
+Region = Mapping[str, Optional[str]]
+
+
+class _CompiledRules(object):
+    """Rules for one region, grouped by kind."""
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        # (month, day, from, to)
+        self.fixed: List[Tuple[int, int, int, int]] = []
+        # (offset, from, to)
+        self.easter: List[Tuple[timedelta, int, int]] = []
+        # (month, weekday, nth, from, to)
+        self.nth_weekday: List[Tuple[int, int, int, int, int]] = []
+
+        for rule in rules:
+            years = (rule.get("from", MIN_YEAR), rule.get("to", MAX_YEAR))
+            if "date" in rule:
+                month, day = (int(part) for part in rule["date"].split("-"))
+                self.fixed.append((month, day, *years))
+            elif "easter" in rule:
+                self.easter.append((timedelta(days=rule["easter"]), *years))
+            else:
+                self.nth_weekday.append((rule["month"], rule["weekday"], rule["nth"], *years))
+
+        # year => holidays of the years evaluated so far
+        self._years: Dict[int, Tuple[date, ...]] = {}
+
+    def evaluate(self, year: int) -> List[date]:
+        holidays = self._years.get(year)
+        if holidays is None:
+            holidays = self._years[year] = tuple(self._evaluate_range(year, year)[year])
+        return list(holidays)
+
+    def evaluate_range(self, start_year: int, end_year: int) -> Dict[int, List[date]]:
+        missing = [year for year in range(start_year, end_year + 1) if year not in self._years]
+        if missing:
+            evaluated = self._evaluate_range(missing[0], missing[-1])
+            self._years.update((year, tuple(holidays)) for year, holidays in evaluated.items())
+        return {year: list(self._years[year]) for year in range(start_year, end_year + 1)}
+
+    def _evaluate_range(self, start_year: int, end_year: int) -> Dict[int, List[date]]:
+        years = range(start_year, end_year + 1)
+        result: Dict[int, List[date]] = {
+            year: [
+                date(year, month, day)
+                for month, day, valid_from, valid_to in self.fixed
+                if valid_from <= year <= valid_to
+            ]
+            for year in years
+        }
+        if self.easter:
+            for year in years:
+                easter_sunday = easter(year)
+                result[year].extend(
+                    easter_sunday + offset
+                    for offset, valid_from, valid_to in self.easter
+                    if valid_from <= year <= valid_to
+                )
+        for month, weekday, nth, valid_from, valid_to in self.nth_weekday:
+            for year in years:
+                if valid_from <= year <= valid_to:
+                    result[year].append(_nth_weekday(year, month, weekday, nth))
+        return result
+
+
+def _nth_weekday(year: int, month: int, weekday: int, nth: int) -> date:
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    if nth > 0:
+        day = 1 + (weekday - first_weekday) % 7 + (nth - 1) * 7
+    else:
+        last_weekday = (first_weekday + days_in_month - 1) % 7
+        day = days_in_month - (last_weekday - weekday) % 7 + (nth + 1) * 7
+    return date(year, month, day)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _validate(rule: Dict[str, Any], regions: Collection[str] = ()) -> None:
+    """Check a rule.
+
+    :param regions: Keys the rule may be limited by besides years
+    :raises ValueError: With the first problem found
+    """
+    unknown = set(rule) - RULE_KEYS - set(regions)
+    if unknown:
+        raise ValueError(f"Unknown keys {', '.join(sorted(unknown))} in holiday rule: {rule}")
+    if rule.keys() & DATE_KEYS not in ({"date"}, {"easter"}, {"month", "weekday", "nth"}):
+        raise ValueError(f"Holiday rule must have exactly one kind of date: {rule}")
+    if "date" in rule:
+        try:
+            month, day = (int(part) for part in rule["date"].split("-"))
+            date(2000, month, day)  # a leap year
+        except (AttributeError, ValueError) as exc:
+            raise ValueError(f"Invalid date (MM-DD) in holiday rule: {rule}") from exc
+    elif "easter" in rule:
+        if not _is_int(rule["easter"]):
+            raise ValueError(f"Invalid Easter offset in holiday rule: {rule}")
+    elif not (
+        _is_int(rule["month"])
+        and 1 <= rule["month"] <= 12
+        and _is_int(rule["weekday"])
+        and 0 <= rule["weekday"] <= 6
+        and _is_int(rule["nth"])
+        and 1 <= abs(rule["nth"]) <= 4
+    ):
+        raise ValueError(f"Invalid month, weekday or nth in holiday rule: {rule}")
+    if not all(_is_int(rule.get(name, MIN_YEAR)) for name in ("from", "to")):
+        raise ValueError(f"Invalid years in holiday rule: {rule}")
+    for name in regions:
+        values = rule.get(name, [])
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"Values of {name} must be a list of strings in holiday rule: {rule}")
+
+
+class HolidayRules(object):
+    """Holiday rules of a locale, compiled once per region."""
+
+    def __init__(self, rules: List[Dict[str, Any]], regions: Collection[str] = ()):
+        """
+        :param regions: Keys of the regions of the locale (e.g. "city")
+        :raises ValueError: If any of the rules is invalid
+        """
+        for rule in rules:
+            _validate(rule, regions)
+        self.rules = rules
+        self._compiled: Dict[Tuple, _CompiledRules] = {}
+
+    def _compile(self, region: Region) -> _CompiledRules:
+        key = tuple(sorted(region.items()))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            matching = [
+                rule
+                for rule in self.rules
+                if all(
+                    region.get(name) in values
+                    for name, values in rule.items()
+                    if name not in RULE_KEYS
+                )
+            ]
+            compiled = self._compiled[key] = _CompiledRules(matching)
+        return compiled
+
+    def evaluate(self, year: int, region: Optional[Region] = None) -> List[date]:
+        """Holidays of one year."""
+        return self._compile(region or {}).evaluate(year)
+
+    def evaluate_range(
+        self, start_year: int, end_year: int, region: Optional[Region] = None
+    ) -> Dict[int, List[date]]:
+        """Holidays of all years from start_year to end_year (both inclusive)."""
+        return self._compile(region or {}).evaluate_range(start_year, end_year)
+
+
+@functools.lru_cache(maxsize=None)
+def get_holiday_rules(name: str, regions: Tuple[str, ...] = ()) -> HolidayRules:
+    """Rules of a locale from holidays.json (e.g. "cs").
+
+    :param regions: Keys of the regions of the locale (see HolidayRules)
+    """
+    with resources.files(__package__).joinpath("holidays.json").open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return HolidayRules(data[name], regions)
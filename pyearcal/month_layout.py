@@ -0,0 +1,169 @@
+"""month_layout module
+
+Geometry and styling of the month grid.
+
+The grid can be drawn either as a reportlab Table (make_table)
+or directly with canvas primitives (draw), with the same look.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Table, TableStyle
+
+# (column, row) => (background colour, text colour)
+CellColors = Dict[Tuple[int, int], Tuple[colors.Color, colors.Color]]
+
+
+class MonthLayout(object):
+    """Day grid of a month: cell geometry, font and default colours.
+
+    The table style commands common to all cells are in style,
+    each month adds the colours of its particular days (see make_style).
+    """
+
+    def __init__(
+        self,
+        cell_width: float,
+        cell_height: float,
+        cell_padding: float,
+        cell_spacing: float,
+        font_name: str,
+        font_size: float,
+        color: colors.Color,
+        bgcolor: colors.Color,
+    ):
+        """
+        :param font_name: Name of a registered font (see font_loader.get_font_name)
+        """
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cell_padding = cell_padding
+        self.cell_spacing = cell_spacing
+        self.font_name = font_name
+        self.font_size = font_size
+        self.color = color
+        self.bgcolor = bgcolor
+        self.col_widths = (cell_width,) * 7
+
+        style = TableStyle()
+        for padding in ("TOP", "RIGHT", "BOTTOM", "LEFT"):
+            style.add(padding + "PADDING", (0, 0), (-1, -1), cell_padding)
+        for position in ("BEFORE", "AFTER", "ABOVE", "BELOW"):
+            style.add("LINE" + position, (0, 0), (-1, -1), cell_spacing / 2, colors.white)
+        style.add("FONT", (0, 0), (-1, -1), font_name, font_size)
+        style.add("ALIGN", (0, 0), (-1, -1), "RIGHT")
+        style.add("VALIGN", (0, 0), (-1, -1), "MIDDLE")
+        style.add("BACKGROUND", (0, 0), (-1, -1), bgcolor)
+        style.add("TEXTCOLOR", (0, 0), (-1, -1), color)
+        self.style = style
+
+    def row_heights(self, weeks: int) -> Tuple[float, ...]:
+        return (self.cell_height,) * weeks
+
+    def table_height(self, weeks: int) -> float:
+        """Height of the grid with a number of weeks (in points)."""
+        return sum(self.row_heights(weeks))
+
+    def make_style(self, cell_colors: Optional[CellColors] = None) -> TableStyle:
+        """A new style with the common commands and the colours of particular cells.
+
+        :param cell_colors: Colours of cells that differ from the default
+        """
+        style = TableStyle(parent=self.style)
+        for cell, (bgcolor, color) in (cell_colors or {}).items():
+            style.add("BACKGROUND", cell, cell, bgcolor)
+            style.add("TEXTCOLOR", cell, cell, color)
+        return style
+
+    def make_table(self, table_data: List[List[Optional[int]]], style: TableStyle) -> Table:
+        """Grid of days (rows of weeks) with a style from make_style."""
+        table = Table(
+            table_data, colWidths=self.col_widths, rowHeights=self.row_heights(len(table_data))
+        )
+        table.setStyle(style)
+        return table
+
+    def draw(
+        self,
+        canv,
+        x: float,
+        y: float,
+        table_data: List[List[Optional[int]]],
+        cell_colors: Optional[CellColors] = None,
+    ) -> float:
+        """Draw the grid directly on a canvas.
+
+        The result looks the same as the Table from make_table:
+        cells inset by the white lines between them, day numbers
+        aligned right and centered vertically (using Table's formula).
+
+        :param x: Left edge (in points)
+        :param y: Bottom edge (in points)
+        :param cell_colors: Colours of cells that differ from the default
+        :returns: Height of the grid
+        """
+        cell_colors = cell_colors or {}
+        row_heights = self.row_heights(len(table_data))
+        height = sum(row_heights)
+        inset = self.cell_spacing / 4  # half of the line width on each side
+
+        # Positions accumulated the same way as in Table
+        col_positions = [x]
+        for width in self.col_widths:
+            col_positions.append(col_positions[-1] + width)
+        row_positions = [y + height]
+        for row_height in row_heights:
+            row_positions.append(row_positions[-1] - row_height)
+
+        backgrounds: Dict[colors.Color, List[Tuple[float, float, float, float]]] = {}
+        texts: Dict[colors.Color, List[Tuple[float, float, str]]] = {}
+        leading = self.font_size * 1.2
+        for row, days in enumerate(table_data):
+            row_height = row_heights[row]
+            row_position = row_positions[row + 1]
+            for column, day in enumerate(days):
+                col_width = self.col_widths[column]
+                col_position = col_positions[column]
+                bgcolor, color = cell_colors.get((column, row), (self.bgcolor, self.color))
+                # The page is white already
+                if bgcolor != colors.white:
+                    backgrounds.setdefault(bgcolor, []).append(
+                        (
+                            col_position + inset,
+                            row_position + inset,
+                            col_width - 2 * inset,
+                            row_height - 2 * inset,
+                        )
+                    )
+                if day:
+                    text = str(day)
+                    text_y = (
+                        row_position
+                        + (self.cell_padding + row_height - self.cell_padding + leading) / 2
+                        - self.font_size
+                    )
+                    text_x = (
+                        col_position
+                        + col_width
+                        - self.cell_padding
+                        - stringWidth(text, self.font_name, self.font_size)
+                    )
+                    texts.setdefault(color, []).append((text_x, text_y, text))
+
+        canv.saveState()
+        for bgcolor, rects in backgrounds.items():
+            canv.setFillColor(bgcolor)
+            for rect in rects:
+                canv.rect(*rect, stroke=0, fill=1)
+
+        text_object = canv.beginText()
+        text_object.setFont(self.font_name, self.font_size, leading)
+        for color, strings in texts.items():
+            text_object.setFillColor(color)
+            for text_x, text_y, text in strings:
+                text_object.setTextOrigin(text_x, text_y)
+                text_object.textOut(text)
+        canv.drawText(text_object)
+        canv.restoreState()
+        return height
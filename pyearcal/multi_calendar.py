@@ -0,0 +1,191 @@
+"""multi_calendar module
+
+Rendering of the same pictures as calendars for several years and locales.
+
+Rendering each calendar on its own would open, scale and compress every
+picture again for each of them. MultiCalendar prepares each picture only
+once for all calendars that need it in the same size and draws the same
+PDF image object in all of them. (The area of a picture depends on the number
+of weeks in its month, i.e. on the year and the first day of the week, but
+often does not limit the size of the picture.)
+Each additional variant then costs little more than drawing its grids and
+writing its document.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import PIL.Image
+from reportlab.pdfgen import canvas
+
+from .image_sources import Pictures
+from .instrumentation import RenderProfile, StageHook
+from .l10n import DefaultLocale, Locale
+from .year_calendar import (
+    PreparedPicture,
+    YearCalendar,
+    _OutputWriter,
+    peak_memory,
+    reset_peak_memory,
+)
+
+Output = Union[str, os.PathLike, IO[bytes]]
+
+# (month, size of the scaled picture in pixels)
+_PictureKey = Tuple[int, Tuple[int, int]]
+
+
+class CalendarVariant(NamedTuple):
+    """What differs between the calendars of a MultiCalendar."""
+
+    year: int
+    locale: Locale = DefaultLocale()
+    special_days: Collection[date] = ()
+
+
+class MultiCalendar(object):
+    """Calendars of several variants (year, locale, special days) with the same pictures.
+
+    The calendars can be written into separate files (render) or as
+    consecutive pages of one document (render_combined). In the latter,
+    each picture is stored in the document only once.
+
+    After rendering, stats contains the number of distinct pictures by how
+    they were prepared (see YearCalendar), "shared" pages that reuse one
+    of them and "peak_memory" (reset before rendering only with
+    measure_peak_memory, see YearCalendar). Timings of all calendars are in profile.
+    """
+
+    def __init__(self, variants: Iterable[CalendarVariant], pictures: Pictures, **kwargs):
+        """
+        :param variants: Year, locale and special days of each calendar
+        :param pictures: A picture source (collection with indexes 1..12)
+        :param kwargs: Attributes shared by all calendars (see YearCalendar)
+        """
+        self.calendars = [
+            YearCalendar(
+                variant.year,
+                pictures,
+                locale=variant.locale,
+                special_days=variant.special_days,
+                **kwargs,
+            )
+            for variant in variants
+        ]
+        if not self.calendars:
+            raise ValueError("No calendar variants to render.")
+        self.stats: Counter[str] = Counter()
+        self.hooks: List[StageHook] = list(kwargs.get("hooks", []))
+        self.profile = RenderProfile(self.hooks)
+        self.measure_peak_memory: bool = kwargs.get("measure_peak_memory", False)
+
+    def _reset(self) -> None:
+        if self.measure_peak_memory:
+            reset_peak_memory()
+        self.stats = Counter()
+        self.profile = RenderProfile(self.hooks)
+        for calendar in self.calendars:
+            calendar.stats = Counter()
+            calendar.profile = self.profile
+
+    def _prepare_pictures(self, workers: Optional[int] = None) -> List[List[PreparedPicture]]:
+        """Pictures of all months for each calendar, each distinct one prepared once.
+
+        :param workers: Number of threads preparing the pictures (None or 1 => serially)
+        """
+        # Only the headers are read to know the sizes
+        sizes: Dict[int, Tuple[int, int]] = {}
+        for month in range(1, 13):
+            with PIL.Image.open(self.calendars[0].pictures[month]) as image:
+                sizes[month] = image.size
+        keys: List[List[_PictureKey]] = [
+            [
+                (month, calendar._scaling_geometry(size, calendar._picture_height(month))[1])
+                for month, size in sizes.items()
+            ]
+            for calendar in self.calendars
+        ]
+        # The first calendar needing a picture prepares it
+        preparing: Dict[_PictureKey, YearCalendar] = {}
+        for calendar, calendar_keys in zip(self.calendars, keys, strict=True):
+            for key in calendar_keys:
+                preparing.setdefault(key, calendar)
+
+        def prepare(key: _PictureKey) -> PreparedPicture:
+            calendar, month = preparing[key], key[0]
+            return calendar._encode_picture(calendar._prepare_picture(month), month)
+
+        if not workers or workers <= 1:
+            pictures = list(map(prepare, preparing))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pictures = list(executor.map(prepare, preparing))
+        prepared = dict(zip(preparing, pictures, strict=True))
+
+        self.stats.update(picture.origin for picture in pictures)
+        self.stats["shared"] = sum(len(calendar_keys) for calendar_keys in keys) - len(prepared)
+        logging.info(
+            f"{len(prepared)} pictures prepared for {len(self.calendars)} calendars "
+            f"({self.stats['shared']} pages share them)."
+        )
+        return [[prepared[key] for key in calendar_keys] for calendar_keys in keys]
+
+    def _save(self, pdf_canvas: canvas.Canvas, writer: _OutputWriter) -> None:
+        try:
+            with self.profile.measure("save"):
+                pdf_canvas.save()
+        finally:
+            writer.close()
+        self.profile.count("bytes_written", writer.bytes_written)
+        logging.info(f"Calendar written to {writer.name} ({writer.bytes_written} bytes).")
+
+    def _finish(self, start: float) -> None:
+        self.profile.total = time.perf_counter() - start
+        self.stats["peak_memory"] = peak_memory()
+        logging.info(f"Peak memory: {self.stats['peak_memory'] / 2**20:.1f} MiB.")
+
+    def render(self, outputs: Sequence[Output], workers: Optional[int] = None) -> None:
+        """Render each calendar into its own PDF file.
+
+        :param outputs: Path or binary file-like object for each variant (in order)
+        :param workers: Number of threads preparing the pictures in parallel
+        """
+        if len(outputs) != len(self.calendars):
+            raise ValueError(f"Expected {len(self.calendars)} outputs, {len(outputs)} given.")
+        start = time.perf_counter()
+        self._reset()
+        pictures = self._prepare_pictures(workers)
+        for calendar, calendar_pictures, output in zip(
+            self.calendars, pictures, outputs, strict=True
+        ):
+            writer = _OutputWriter(output)
+            pdf_canvas = canvas.Canvas(writer, calendar.pagesize, invariant=calendar.invariant)
+            pdf_canvas.setTitle(f"{calendar.locale.calendar_name} {calendar.year}")
+            calendar.draw_pages(pdf_canvas, calendar_pictures)
+            self._save(pdf_canvas, writer)
+        self._finish(start)
+
+    def render_combined(self, output: Output, workers: Optional[int] = None) -> None:
+        """Render all calendars one after another into a single PDF file.
+
+        :param output: Path to write to or a binary file-like object
+        :param workers: Number of threads preparing the pictures in parallel
+        """
+        start = time.perf_counter()
+        self._reset()
+        pictures = self._prepare_pictures(workers)
+        writer = _OutputWriter(output)
+        pdf_canvas = canvas.Canvas(
+            writer, self.calendars[0].pagesize, invariant=self.calendars[0].invariant
+        )
+        titles = (f"{calendar.locale.calendar_name} {calendar.year}" for calendar in self.calendars)
+        pdf_canvas.setTitle(", ".join(dict.fromkeys(titles)))
+        for calendar, calendar_pictures in zip(self.calendars, pictures, strict=True):
+            calendar.draw_pages(pdf_canvas, calendar_pictures)
+        self._save(pdf_canvas, writer)
+        self._finish(start)
@@ -0,0 +1,292 @@
+"""photo_library module
+
+Persistent index of photos in a directory tree and an image source
+picking from it by metadata.
+
+The index (SQLite) stores for each photo its file size and modification
+time, dimensions and EXIF orientation and date. Updating it reads only
+the headers of new or changed files (compared by size and mtime),
+so it stays cheap for large libraries. Queries then select photos of the
+right shape and resolution without opening any of them.
+"""
+import logging
+import os
+import random
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .image_sources import MONTHS, ImageSource
+
+# Extensions of the files to index (compared case-insensitively)
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp")
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    exif_orientation INTEGER,
+    taken TEXT
+);
+CREATE INDEX IF NOT EXISTS photos_taken ON photos (taken);
+"""
+
+# EXIF tags
+_ORIENTATION = 0x0112
+_DATE_TIME = 0x0132
+_EXIF_IFD = 0x8769
+_DATE_TIME_ORIGINAL = 0x9003
+
+
+class Photo(NamedTuple):
+    """A photo in the library."""
+
+    path: str
+    size: int  # in bytes
+    mtime_ns: int
+    width: int  # in pixels, as stored (EXIF orientation not applied)
+    height: int
+    exif_orientation: Optional[int]
+    taken: Optional[datetime]
+
+    @property
+    def orientation(self) -> str:
+        """One of "landscape", "portrait" or "square" (as the picture is rendered)."""
+        if self.width > self.height:
+            return "landscape"
+        if self.width < self.height:
+            return "portrait"
+        return "square"
+
+
+def default_library_path() -> str:
+    from .cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "photos.sqlite")
+
+
+def _read_metadata(path: str) -> Tuple[int, int, Optional[int], Optional[datetime]]:
+    """Dimensions, EXIF orientation and date of a photo (only its header is read)."""
+    import PIL.Image
+
+    with PIL.Image.open(path) as image:
+        width, height = image.size
+        exif = image.getexif()
+    orientation = exif.get(_ORIENTATION)
+    taken = None
+    value = exif.get_ifd(_EXIF_IFD).get(_DATE_TIME_ORIGINAL) or exif.get(_DATE_TIME)
+    if value:
+        try:
+            taken = datetime.strptime(str(value).strip("\x00 "), "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            logging.debug(f"Invalid EXIF date in {path}: {value!r}")
+    return width, height, orientation, taken
+
+
+class PhotoLibrary(object):
+    """Photos under a root directory, indexed in an SQLite database.
+
+    The database can be shared by libraries with different roots.
+    Call update to (re)index the files, then query.
+    """
+
+    def __init__(self, root: str, path: Optional[str] = None):
+        """
+        :param root: Directory with the photos (searched recursively)
+        :param path: The index database (default: in the cache directory)
+        """
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.path = path or default_library_path()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A new connection for each operation, libraries are used from worker threads
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            connection.executescript(f"DROP TABLE IF EXISTS photos;{SCHEMA}")
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return connection
+
+    def _prefix(self) -> Tuple[int, str]:
+        """(length, prefix) of the paths under the root (for SQL substr)."""
+        prefix = os.path.join(self.root, "")
+        return len(prefix), prefix
+
+    def _walk(self) -> Iterator[os.DirEntry]:
+        directories = [self.root]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.name.lower().endswith(PHOTO_EXTENSIONS) and entry.is_file():
+                        yield entry
+
+    def update(self) -> Tuple[int, int]:
+        """Index new and changed photos, forget the removed ones.
+
+        :returns: Number of (indexed, removed) photos
+        """
+        with closing(self._connect()) as connection, connection:
+            known: Dict[str, Tuple[int, int]] = {
+                path: (size, mtime_ns)
+                for path, size, mtime_ns in connection.execute(
+                    "SELECT path, size, mtime_ns FROM photos WHERE substr(path, 1, ?) = ?",
+                    self._prefix(),
+                )
+            }
+            indexed = 0
+            for entry in self._walk():
+                stat = entry.stat()
+                if known.pop(entry.path, None) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                try:
+                    width, height, orientation, taken = _read_metadata(entry.path)
+                except (OSError, SyntaxError) as exc:
+                    logging.debug(f"Cannot index photo {entry.path}: {exc}")
+                    connection.execute("DELETE FROM photos WHERE path = ?", (entry.path,))
+                    continue
+                connection.execute(
+                    "INSERT OR REPLACE INTO photos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry.path,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        width,
+                        height,
+                        orientation,
+                        taken.isoformat() if taken else None,
+                    ),
+                )
+                indexed += 1
+            # What is left was not found anymore
+            connection.executemany("DELETE FROM photos WHERE path = ?", ((p,) for p in known))
+        logging.info(f"Photo library {self.root}: {indexed} indexed, {len(known)} removed.")
+        return indexed, len(known)
+
+    def query(
+        self,
+        *,
+        orientation: Optional[str] = None,
+        min_width: int = 0,
+        min_height: int = 0,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> List[Photo]:
+        """Photos matching all the conditions.
+
+        :param orientation: "landscape", "portrait" or "square"
+        :param min_width: In pixels
+        :param min_height: In pixels
+        :param year: Year the photo was taken in (photos without EXIF date never match)
+        :param month: Month the photo was taken in
+        """
+        conditions = ["substr(path, 1, ?) = ?", "width >= ?", "height >= ?"]
+        params: List = [*self._prefix(), min_width, min_height]
+        if orientation is not None:
+            comparison = {"landscape": ">", "portrait": "<", "square": "="}[orientation]
+            conditions.append(f"width {comparison} height")
+        if year is not None:
+            conditions.append("CAST(strftime('%Y', taken) AS INTEGER) = ?")
+            params.append(year)
+        if month is not None:
+            conditions.append("CAST(strftime('%m', taken) AS INTEGER) = ?")
+            params.append(month)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT path, size, mtime_ns, width, height, exif_orientation, taken"
+                f" FROM photos WHERE {' AND '.join(conditions)} ORDER BY path",
+                params,
+            ).fetchall()
+        return [
+            Photo(
+                path=path,
+                size=size,
+                mtime_ns=mtime_ns,
+                width=width,
+                height=height,
+                exif_orientation=exif_orientation,
+                taken=datetime.fromisoformat(taken) if taken else None,
+            )
+            for path, size, mtime_ns, width, height, exif_orientation, taken in rows
+        ]
+
+
+class PhotoLibrarySource(ImageSource):
+    """Image source picking photos from a PhotoLibrary by their metadata.
+
+    For each month, a random photo taken in that month is chosen
+    (of any year unless specified). Months without such a photo get
+    a random one of the remaining candidates.
+
+    Use YearCalendar.min_picture_size for min_size, so that no photo
+    needs to be upscaled. Pass the method itself (not its result) for the
+    "fit" scaling, then the size required depends on the aspect ratio
+    of each photo.
+    """
+
+    def __init__(
+        self,
+        library: PhotoLibrary,
+        *,
+        orientation: Optional[str] = "landscape",
+        min_size: Union[Tuple[int, int], Callable[[float], Tuple[int, int]]] = (0, 0),
+        year: Optional[int] = None,
+        by_month: bool = True,
+        update: bool = True,
+    ):
+        """
+        :param orientation: Shape of the photos (None => any)
+        :param min_size: Minimum (width, height) in pixels or a function
+            of the aspect ratio (width / height) of a photo returning it
+        :param year: Year the photos were taken in (None => any)
+        :param by_month: Whether to match the month the photo was taken in
+        :param update: Whether to update the library index first
+        """
+        super().__init__()
+        self.library = library
+        self.orientation = orientation
+        self.min_size = min_size
+        self.year = year
+        self.by_month = by_month
+        if update:
+            library.update()
+
+    def _is_large_enough(self, photo: Photo) -> bool:
+        assert callable(self.min_size)
+        min_width, min_height = self.min_size(photo.width / photo.height)
+        return photo.width >= min_width and photo.height >= min_height
+
+    def _pick(self) -> List[str]:
+        min_width, min_height = (0, 0) if callable(self.min_size) else self.min_size
+        candidates = self.library.query(
+            orientation=self.orientation, min_width=min_width, min_height=min_height, year=self.year
+        )
+        if callable(self.min_size):
+            candidates = [photo for photo in candidates if self._is_large_enough(photo)]
+        if len(candidates) < len(MONTHS):
+            raise ValueError(f"Not enough matching photos in the library: {len(candidates)}")
+        random.shuffle(candidates)
+
+        picked: Dict[int, Photo] = {}
+        if self.by_month:
+            for photo in candidates:
+                if photo.taken and photo.taken.month not in picked:
+                    picked[photo.taken.month] = photo
+        used = {photo.path for photo in picked.values()}
+        remaining = (photo for photo in candidates if photo.path not in used)
+        return [picked[month].path if month in picked else next(remaining).path for month in MONTHS]
+
+    def _resolve(self, index: int) -> str:
+        # All months are picked together (called with the lock held)
+        if not self.images:
+            self.images.update(zip(MONTHS, self._pick(), strict=True))
+        return self.images[index]
@@ -0,0 +1,238 @@
+"""preview module
+
+Quick previews of a calendar while designing it.
+
+- draft_calendar : A copy of a calendar rendering a draft PDF in a fraction
+  of the time: pictures at a very low resolution (JPEG files are decoded
+  at a reduced scale, see YearCalendar._scale_picture) and the standard
+  PDF fonts, which are not embedded (where they can show the texts).
+- render_proofs : Pages as PIL images (PNG proofs) drawn directly
+  with Pillow, without creating a PDF at all.
+
+Both draw the pages with the same code as the full rendering
+(grids are drawn with canvas primitives), only the output differs.
+"""
+import copy
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+
+from .instrumentation import RenderProfile
+
+# Resolution of draft PDFs and proofs (in pixels per inch)
+DRAFT_DPI = 36
+PROOF_DPI = 36
+
+# Font family of drafts (standard PDF font, not embedded)
+DRAFT_FONT = "Helvetica"
+
+# Encoding of texts in the standard PDF fonts (WinAnsiEncoding)
+DRAFT_FONT_ENCODING = "cp1252"
+
+Color = Tuple[int, int, int]
+# Pillow's default font is a bitmap one without FreeType
+PILFont = Union[PIL.ImageFont.FreeTypeFont, PIL.ImageFont.ImageFont]
+
+
+def draft_calendar(calendar, dpi: int = DRAFT_DPI, standard_fonts: bool = True):
+    """A copy of the calendar for quick previews.
+
+    :param dpi: Resolution of the pictures
+    :param standard_fonts: Whether to replace the fonts by DRAFT_FONT.
+        The month titles keep their font if DRAFT_FONT cannot show them
+        (e.g. "Březen" in Czech), the days are only numbers.
+    """
+    draft = copy.copy(calendar)
+    draft.image_dpi = dpi
+    draft.image_cache = None
+    draft.grid_renderer = "canvas"
+    if standard_fonts:
+        draft.cell_font_name = DRAFT_FONT
+        titles = [
+            calendar.locale.get_month_title(
+                calendar.year, month, calendar.include_year_in_month_name
+            )
+            for month in range(1, 13)
+        ]
+        if _is_encodable(titles, DRAFT_FONT_ENCODING):
+            draft.title_font_name = DRAFT_FONT
+        else:
+            logging.debug(f"Month titles need {calendar.title_font_name}, keeping it.")
+    draft.stats = Counter()
+    draft.profile = RenderProfile(calendar.hooks)
+    return draft
+
+
+def _is_encodable(texts: Iterable[str], encoding: str) -> bool:
+    try:
+        for text in texts:
+            text.encode(encoding)
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _rgb(color: colors.Color) -> Color:
+    return tuple(round(255 * component) for component in color.rgb())  # type: ignore
+
+
+class _ProofText(object):
+    """Text object of ProofCanvas (the subset of reportlab's PDFTextObject in use)."""
+
+    def __init__(self) -> None:
+        self.operations: List[Tuple[str, Any]] = []
+
+    def setFont(self, name: str, size: float, leading: Optional[float] = None) -> None:
+        self.operations.append(("font", (name, size)))
+
+    def setFillColor(self, color: colors.Color) -> None:
+        self.operations.append(("color", color))
+
+    def setTextOrigin(self, x: float, y: float) -> None:
+        self.operations.append(("origin", (x, y)))
+
+    def textOut(self, text: str) -> None:
+        self.operations.append(("text", text))
+
+
+class ProofCanvas(object):
+    """Stand-in for reportlab's Canvas drawing the pages as PIL images.
+
+    Only the operations used by YearCalendar are supported
+    (with the "canvas" grid renderer).
+    """
+
+    def __init__(self, pagesize: Tuple[float, float], dpi: int = PROOF_DPI):
+        self.pagesize = pagesize
+        self.scale = dpi / 72
+        self.size = (round(pagesize[0] * self.scale), round(pagesize[1] * self.scale))
+        self.pages: List[PIL.Image.Image] = []
+        self._fonts: Dict[Tuple[str, float], PILFont] = {}
+        self._states: List[Tuple[Color, Tuple[str, float]]] = []
+        self._new_page()
+
+    def _new_page(self) -> None:
+        self.page = PIL.Image.new("RGB", self.size, "white")
+        self.draw = PIL.ImageDraw.Draw(self.page)
+        self.fill: Color = (0, 0, 0)
+        self.font = ("Helvetica", 12.0)
+
+    def _point(self, x: float, y: float) -> Tuple[float, float]:
+        """Pixel coordinates of a point in PDF coordinates (origin at the bottom)."""
+        return x * self.scale, (self.pagesize[1] - y) * self.scale
+
+    def _pil_font(self, name: str, size: float) -> PILFont:
+        """The same TrueType font as in the PDF, Pillow's default for standard fonts."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            face = getattr(pdfmetrics.getFont(name), "face", None)
+            path = getattr(face, "filename", None)
+            if path and os.path.isfile(path):
+                font = PIL.ImageFont.truetype(path, size * self.scale)
+            else:
+                font = PIL.ImageFont.load_default(size * self.scale)
+            self._fonts[key] = font
+        return font
+
+    def _text(self, x: float, y: float, text: str) -> None:
+        self.draw.text(
+            self._point(x, y), text, fill=self.fill, font=self._pil_font(*self.font), anchor="ls"
+        )
+
+    def setTitle(self, title: str) -> None:
+        pass
+
+    def saveState(self) -> None:
+        self._states.append((self.fill, self.font))
+
+    def restoreState(self) -> None:
+        self.fill, self.font = self._states.pop()
+
+    def setFillColor(self, color: colors.Color) -> None:
+        self.fill = _rgb(color)
+
+    def setFont(self, name: str, size: float, leading: Optional[float] = None) -> None:
+        self.font = (name, size)
+
+    def rect(self, x: float, y: float, width: float, height: float, stroke=1, fill=0) -> None:
+        left, bottom = self._point(x, y)
+        right, top = self._point(x + width, y + height)
+        self.draw.rectangle(
+            (left, top, right, bottom), fill=self.fill if fill else None, outline=None
+        )
+
+    def drawString(self, x: float, y: float, text: str) -> None:
+        self._text(x, y, text)
+
+    def beginText(self) -> _ProofText:
+        return _ProofText()
+
+    def drawText(self, text_object: _ProofText) -> None:
+        saved = self.fill, self.font
+        x, y = 0.0, 0.0
+        for operation, value in text_object.operations:
+            if operation == "font":
+                self.font = value
+            elif operation == "color":
+                self.setFillColor(value)
+            elif operation == "origin":
+                x, y = value
+            else:
+                self._text(x, y, value)
+        self.fill, self.font = saved
+
+    def drawImage(self, image, x: float, y: float, width: float, height: float, **kwargs) -> None:
+        """Paste a picture (path, PIL image or reportlab's ImageReader of one)."""
+        picture = getattr(image, "_image", None) or image
+        if not isinstance(picture, PIL.Image.Image):
+            picture = PIL.Image.open(getattr(picture, "fileName", picture))
+        left, top = self._point(x, y + height)
+        size = (round(width * self.scale), round(height * self.scale))
+        if picture.size != size:
+            picture = picture.resize(size, reducing_gap=2.0)
+        self.page.paste(picture.convert("RGB"), (round(left), round(top)))
+
+    def showPage(self) -> None:
+        self.pages.append(self.page)
+        self._new_page()
+
+    def save(self) -> None:
+        pass
+
+
+def render_proofs(
+    calendar, dpi: int = PROOF_DPI, workers: Optional[int] = None
+) -> List[PIL.Image.Image]:
+    """Proofs of all pages of a calendar (as RGB images).
+
+    :param dpi: Resolution of the pages (and pictures on them)
+    :param workers: Number of threads preparing the pictures (see YearCalendar.render)
+    """
+    draft = draft_calendar(calendar, dpi, standard_fonts=False)
+    proof_canvas = ProofCanvas(calendar.pagesize, dpi)
+    draft.draw_pages(proof_canvas, workers=workers)  # type: ignore[arg-type]
+    return proof_canvas.pages
+
+
+def save_proofs(
+    calendar, directory: str, dpi: int = PROOF_DPI, workers: Optional[int] = None
+) -> List[str]:
+    """Write proofs of all pages as PNG files (01.png ... 12.png).
+
+    :returns: Paths of the files
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for month, page in enumerate(render_proofs(calendar, dpi, workers), start=1):
+        path = os.path.join(directory, f"{month:02d}.png")
+        page.save(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,349 @@
+"""server module
+
+Long-running HTTP service rendering calendars (see `pyearcal serve`).
+
+Starting the command line for each calendar pays the import of reportlab
+and PIL and the loading of fonts every time. The service renders in a pool
+of worker processes that stay alive, each with its fonts, locales and image
+cache warm (see batch). It needs no network access besides its own socket.
+
+Endpoints:
+
+- POST /render : Body is a job as in batch manifests (JSON object, without
+  "output"), the response is the PDF (application/pdf). The source must be
+  inside one of the allowed roots, the font is a name of an installed font,
+  special days are a list of ISO dates and the year and image_dpi are
+  integers in YEAR_RANGE and IMAGE_DPI_RANGE.
+- GET /metrics : Queue depth, counts and latencies (JSON)
+- GET /health : "ok"
+
+At most `workers` calendars are rendered at the same time and at most
+`queue_size` requests wait for a worker, further ones are rejected
+with 503. Jobs refer to pictures on the server, so the service is meant
+to listen only locally (default) or on a Unix socket. Failures are logged,
+clients get only a generic message.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Deque, Dict, Mapping, Optional, Sequence, Tuple
+
+from .batch import JOB_OPTIONS, _init_worker, build_calendar
+from .font_loader import FontNotFound
+
+DEFAULT_PORT = 8080
+
+# Maximum size of a request body (a job) in bytes
+MAX_BODY_SIZE = 1024**2
+
+CHUNK_SIZE = 64 * 1024
+
+# Number of the most recent requests the latencies are computed from
+LATENCY_WINDOW = 1000
+
+# Allowed years (those with Easter dates, see dateutil.easter) and resolutions
+# of pictures (bounding the memory a worker needs for a job)
+YEAR_RANGE = (1583, 4099)
+IMAGE_DPI_RANGE = (1, 600)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Failure of a request reported to the client with a status code."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def render_pdf(job: Mapping[str, Any]) -> bytes:
+    """Render a job into PDF bytes (in a worker process)."""
+    output = BytesIO()
+    build_calendar(job).render(output)
+    return output.getvalue()
+
+
+def _is_within(path: str, root: str) -> bool:
+    return os.path.commonpath([path, root]) == root
+
+
+def _is_int_in(value: Any, bounds: Tuple[int, int]) -> bool:
+    return (
+        isinstance(value, int) and not isinstance(value, bool) and bounds[0] <= value <= bounds[1]
+    )
+
+
+def _percentile(values: list, fraction: float) -> float:
+    """Value at the fraction of sorted values (nearest rank)."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class RenderServer(object):
+    """Asyncio HTTP server rendering calendars in a pool of processes."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = 16,
+        cache_dir: Optional[str] = None,
+        roots: Sequence[str] = (),
+    ):
+        """
+        :param workers: Number of worker processes (default: number of CPUs)
+        :param queue_size: Maximum number of requests waiting for a worker
+        :param cache_dir: Directory for scaled pictures shared by the workers
+            (default: in the cache directory, see ImageCache)
+        :param roots: Directories that job sources must be in
+            (default: the current directory)
+        """
+        from .cache import default_cache_dir
+
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.roots = [os.path.realpath(root) for root in roots or [os.getcwd()]]
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "images")
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.pending = 0  # accepted render requests not finished yet
+        self.running = 0
+        self.counts: Dict[str, int] = {"completed": 0, "failed": 0, "rejected": 0}
+        # (seconds waiting for a worker, seconds rendering) of recent requests
+        self.latencies: Deque[Tuple[float, float]] = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.time()
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(wait for wait, _ in self.latencies)
+        totals = sorted(wait + render for wait, render in self.latencies)
+        latency = {
+            name: {
+                "mean": sum(values) / len(values),
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+            }
+            for name, values in (("wait", waits), ("total", totals))
+            if values
+        }
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.pending - self.running,
+            "queue_size": self.queue_size,
+            **self.counts,
+            "latency": latency,
+            "uptime": time.time() - self.started,
+        }
+
+    def _check_job(self, job: Mapping[str, Any]) -> Dict[str, Any]:
+        """Validate a job from a request, return it as rendered by a worker.
+
+        Nothing in a job may refer to other files on the server than
+        the pictures in the allowed roots.
+        """
+        unknown = set(job) - set(JOB_OPTIONS)
+        if unknown:
+            raise HTTPError(f"Unknown options: {', '.join(sorted(unknown))}")
+        forbidden = {"output", "cache_dir"} & set(job)
+        if forbidden:
+            raise HTTPError(f"Options not allowed: {', '.join(sorted(forbidden))}")
+        checked = dict(job)
+
+        source = job.get("source", ".")
+        if not isinstance(source, str) or not source:
+            raise HTTPError("The source must be a path to a directory")
+        checked["source"] = os.path.realpath(source)
+        if not any(_is_within(checked["source"], root) for root in self.roots):
+            raise HTTPError("The source is not in an allowed directory", 403)
+
+        for name, bounds in (("year", YEAR_RANGE), ("image_dpi", IMAGE_DPI_RANGE)):
+            if name in job and not _is_int_in(job[name], bounds):
+                raise HTTPError(f"The {name} must be an integer from {bounds[0]} to {bounds[1]}")
+
+        font = job.get("font")
+        separators = [sep for sep in (os.sep, os.altsep) if sep]
+        if font is not None and (
+            not isinstance(font, str) or any(sep in font for sep in separators)
+        ):
+            raise HTTPError("The font must be a name of an installed font")
+
+        special_days = job.get("special_days")
+        if special_days is not None:
+            if not isinstance(special_days, list) or not all(
+                isinstance(day, str) for day in special_days
+            ):
+                raise HTTPError("Special days must be a list of ISO dates")
+            try:
+                for day in special_days:
+                    date.fromisoformat(day)
+            except ValueError as exc:
+                raise HTTPError("Special days must be a list of ISO dates") from exc
+        return {**checked, "cache_dir": self.cache_dir}
+
+    async def _render(self, job: Mapping[str, Any]) -> bytes:
+        """Render a job in the pool, waiting for a free worker."""
+        assert self.executor is not None and self._slots is not None
+        if self.pending >= self.workers + self.queue_size:
+            self.counts["rejected"] += 1
+            raise HTTPError("Too many requests waiting", 503)
+        checked_job = self._check_job(job)
+
+        self.pending += 1
+        accepted = time.perf_counter()
+        try:
+            async with self._slots:
+                started = time.perf_counter()
+                self.running += 1
+                executor = self.executor
+                try:
+                    pdf = await asyncio.get_running_loop().run_in_executor(
+                        executor, render_pdf, checked_job
+                    )
+                finally:
+                    self.running -= 1
+        except (ValueError, OSError, FontNotFound) as exc:
+            # Invalid options, missing pictures, ... (the details stay on the server)
+            self.counts["failed"] += 1
+            logging.warning(f"Job {checked_job} failed: {type(exc).__name__}: {exc}")
+            raise HTTPError("The job cannot be rendered (invalid options or pictures)") from exc
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory), the pool cannot be used anymore
+            self.counts["failed"] += 1
+            if executor is self.executor:  # not replaced by another request yet
+                self._start_pool()
+            raise
+        except Exception:
+            self.counts["failed"] += 1
+            raise
+        finally:
+            self.pending -= 1
+        self.counts["completed"] += 1
+        self.latencies.append((started - accepted, time.perf_counter() - started))
+        return pdf
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        """(method, path, body) of an HTTP/1.x request."""
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise HTTPError("Invalid request line")
+        method, path, _ = request_line
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError as exc:
+            raise HTTPError("Invalid Content-Length") from exc
+        if length > MAX_BODY_SIZE:
+            raise HTTPError("Request body too large", 413)
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+    ) -> None:
+        """Send a whole response, the body in chunks as the client takes them."""
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+        )
+        view = memoryview(body)
+        for offset in range(0, len(body), CHUNK_SIZE):
+            writer.write(view[offset : offset + CHUNK_SIZE])
+            await writer.drain()
+        await writer.drain()
+
+    async def _error(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        await self._respond(writer, status, json.dumps({"error": message}).encode("utf-8"))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one request per connection."""
+        try:
+            method, path, body = await self._read_request(reader)
+            if path == "/render":
+                if method != "POST":
+                    raise HTTPError("Use POST", 405)
+                try:
+                    job = json.loads(body)
+                except ValueError as exc:
+                    raise HTTPError(f"Invalid JSON: {exc}") from exc
+                if not isinstance(job, dict):
+                    raise HTTPError("The job must be a JSON object")
+                await self._respond(writer, 200, await self._render(job), "application/pdf")
+            elif path == "/metrics" and method == "GET":
+                await self._respond(writer, 200, json.dumps(self.metrics()).encode("utf-8"))
+            elif path == "/health" and method == "GET":
+                await self._respond(writer, 200, b"ok", "text/plain")
+            else:
+                raise HTTPError(f"Unknown endpoint: {method} {path}", 404)
+        except HTTPError as exc:
+            await self._error(writer, exc.status, str(exc))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            logging.debug("Client disconnected.")
+        except Exception:
+            logging.exception("Request failed.")
+            await self._error(writer, 500, "Internal error")
+        finally:
+            writer.close()
+
+    def _start_pool(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: Optional[str] = None
+    ) -> None:
+        """Run until cancelled.
+
+        :param path: Unix socket to listen on instead of host and port
+        """
+        self._slots = asyncio.Semaphore(self.workers)
+        self._start_pool()
+        try:
+            # Start (and warm up) all workers before the first request
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(loop.run_in_executor(self.executor, time.sleep, 0.1) for _ in range(self.workers))
+            )
+            if path:
+                server = await asyncio.start_unix_server(self.handle, path)
+                logging.info(f"Serving on {path} with {self.workers} workers.")
+            else:
+                server = await asyncio.start_server(self.handle, host, port)
+                logging.info(f"Serving on http://{host}:{port} with {self.workers} workers.")
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
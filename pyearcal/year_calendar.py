@@ -1,23 +1,127 @@
 from __future__ import division, absolute_import
 from datetime import date
 
+import copy
+import hashlib
 import logging
+import math
+import os
+import sys
+import time
 
 from calendar import Calendar
+from collections import Counter, deque
 from collections.abc import Collection
-from typing import Any, Iterable
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 
 import PIL
 from pyearcal.l10n.default import Locale
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm, mm
-from reportlab.lib.utils import ImageReader
+from reportlab.lib.utils import ImageReader, _digester
 from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
+from reportlab import rl_config
 
+from .cache import ImageCache
+from .day_categories import HOLIDAY, SPECIAL_DAY, WEEKEND, DayCategories
+from .image_sources import Pictures
+from .instrumentation import RenderProfile, StageHook
 from .l10n import DefaultLocale
-from . import font_loader
+from .month_layout import CellColors, MonthLayout
+from .smartcrop import find_crop_box
+from . import font_loader, incremental
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def reset_peak_memory() -> None:
+    """Start measuring the peak memory anew (see peak_memory).
+
+    Only possible on Linux, elsewhere the peak is over the whole process.
+    The peak is reset for the whole process, so this is not thread-safe:
+    it spoils the measurement of renderings running in other threads.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # Resets the peak resident set size
+    except OSError:
+        pass
+
+
+def peak_memory() -> int:
+    """Peak resident memory in bytes (0 if not available).
+
+    On Linux, this is the peak since the last reset_peak_memory
+    (see measure_peak_memory of YearCalendar). Otherwise, it is the peak
+    of the whole process so far.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PreparedPicture(NamedTuple):
+    """A scaled picture ready to be drawn on the canvas."""
+
+    image: Any  # PIL image, path to a JPEG file or PDFImageXObject (see _encode_picture)
+    width: float  # in points
+    height: float  # in points
+    origin: str = "scaled"  # "scaled", "cached" or "passthrough"
+
+
+class _OutputWriter(object):
+    """Binary writer for the PDF output, counting the bytes written.
+
+    The output is either a path or a binary file-like object.
+    A path is opened only when the first bytes arrive,
+    so that a failed rendering does not leave an empty file behind.
+    """
+
+    def __init__(self, output: Union[str, os.PathLike, IO[bytes]]):
+        self.output = output
+        self.bytes_written = 0
+        self._file: Optional[IO[bytes]] = None
+
+    @property
+    def name(self) -> str:
+        if hasattr(self.output, "write"):
+            return str(getattr(self.output, "name", "<stream>"))
+        return os.fspath(self.output)  # type: ignore[arg-type]
+
+    def write(self, data: bytes) -> int:
+        if self._file is None:
+            if hasattr(self.output, "write"):
+                self._file = self.output  # type: ignore[assignment]
+            else:
+                self._file = open(self.output, "wb")  # type: ignore[arg-type]
+        self._file.write(data)  # type: ignore[union-attr]
+        self.bytes_written += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        """Close the file if opened here, flush a file-like object otherwise."""
+        if self._file is None:
+            return
+        if self._file is self.output:
+            self._file.flush()
+        else:
+            self._file.close()
 
 
 class YearCalendar(object):
@@ -39,13 +143,32 @@ class YearCalendar(object):
         pictures are scaled (and transformed) to fit in the desired area.
 
         - "squarecrop" : Take square area and put a cropped picture inside
+        - "smartcrop" : As squarecrop, but the square is placed over the most
+          detailed part of the picture instead of its centre (see smartcrop)
         - "fit" : Take the largest area possible and fit the whole image inside
 
+    Grid renderers:
+        The grid of days (as grid_renderer attribute) can be drawn
+        in two ways with the same look.
+
+        - "table" : Using reportlab's Table
+        - "canvas" : Directly with canvas primitives (faster, smaller PDF)
+
     Attributes:
     - holidays: A list of datetime.date's (default: from locale)
     - pagesize: (width, height) in points (default: A4)
     - scaling: Scaling algorithm (default: squarecrop, see above)
+    - resample: PIL resampling filter for scaling (default: None => PIL default)
+    - image_cache: ImageCache to store scaled pictures in (default: None)
+    - invariant: Whether the PDF is the same whenever it is rendered, i.e. without
+      the time of rendering (default: reportlab's rl_config.invariant)
     - margins: (top, right, bottom, left) in points (default: 1.33cm)
+    - grid_renderer: How the grid of days is drawn (default: table, see above)
+    - hooks: Callables hook(stage, month, seconds) invoked after each
+      rendering stage (see instrumentation module)
+    - measure_peak_memory: Whether to reset the peak memory of the process
+      before rendering, so that stats has the peak of this rendering only
+      (default: False). Not thread-safe, see reset_peak_memory.
 
     - title_font_name: Name of a registered font (see above)
     - title_font_size: Month title font size in pt (default 24)
@@ -53,12 +176,30 @@ class YearCalendar(object):
 
     - include_year_in_month_name: Whether to include year in month title (default: False)
 
+    After rendering, stats contains the number of pictures by how they
+    were prepared ("scaled", "cached" or "passthrough" for JPEG files
+    embedded without re-encoding) and "peak_memory" in bytes
+    (see peak_memory and measure_peak_memory).
+    Timings of the rendering stages are in profile (see RenderProfile).
+
+    Memory:
+        Each picture is decoded only when it is prepared and its pixels
+        are freed right after it is embedded in the page. With workers,
+        at most as many pictures as workers are prepared ahead of the page
+        being drawn. The memory needed thus does not grow with the number
+        of pages (except for the compressed PDF itself).
+
     """
 
+    # Attributes the day categories are computed from (see day_categories)
+    _DAY_CATEGORY_SOURCES = ("year", "locale", "holidays", "special_days")
+
+    _day_categories: Optional[DayCategories] = None
+
     def __init__(
         self,
         year: int,
-        pictures: Iterable[str] = (),
+        pictures: Pictures = (),
         *,
         locale: Locale = DefaultLocale(),
         special_days: Collection[date] = (),
@@ -78,14 +219,16 @@ class YearCalendar(object):
 
         self.scaling = kwargs.get("scaling", "squarecrop")
         self.image_dpi: int = kwargs.get("image_dpi", 72)
+        self.resample = kwargs.get("resample", None)
+        self.image_cache: Optional[ImageCache] = kwargs.get("image_cache", None)
+        self.invariant: bool = kwargs.get("invariant", bool(rl_config.invariant))
 
         self.holidays = kwargs.get("holidays", self.locale.get_holidays(self.year))
         self.pagesize = kwargs.get("pagesize", A4)
-        self.margins = kwargs.get(
-            "margins", (1.33 * cm,) * 4
-        )  # top, right, bottom, left
+        self.margins = kwargs.get("margins", (1.33 * cm,) * 4)  # top, right, bottom, left
 
         self.max_table_height = kwargs.get("max_table_height", self.content_height / 4)
+        self.grid_renderer = kwargs.get("grid_renderer", "table")
 
         self.title_font_name = kwargs.get("title_font_name", "DejaVu Sans")
         self.title_font_variant = kwargs.get("title_font_variant", font_loader.BOLD)
@@ -101,52 +244,88 @@ class YearCalendar(object):
         self.week_color = kwargs.get("week_color", colors.Color(0.2, 0.2, 0.2))
         self.week_bgcolor = kwargs.get("week_bgcolor", colors.white)
         self.weekend_color = kwargs.get("weekend_color", colors.white)
-        self.weekend_bgcolor = kwargs.get(
-            "weekend_bgcolor", colors.Color(0.7, 0.7, 0.7)
-        )
+        self.weekend_bgcolor = kwargs.get("weekend_bgcolor", colors.Color(0.7, 0.7, 0.7))
         self.holiday_color = kwargs.get("holiday_color", self.weekend_color)
-        self.holiday_bgcolor = kwargs.get(
-            "holiday_bgcolor", colors.Color(0.4, 0.4, 0.4)
-        )
+        self.holiday_bgcolor = kwargs.get("holiday_bgcolor", colors.Color(0.4, 0.4, 0.4))
         self.special_day_color = kwargs.get("special_day_color", colors.white)
-        self.special_day_bgcolor = kwargs.get(
-            "special_day_bgcolor", colors.Color(0.2, 0.2, 0.2)
-        )
+        self.special_day_bgcolor = kwargs.get("special_day_bgcolor", colors.Color(0.2, 0.2, 0.2))
 
-        self.include_year_in_month_name = kwargs.get(
-            "include_year_in_month_name", False
-        )
+        self.include_year_in_month_name = kwargs.get("include_year_in_month_name", False)
 
         # Initialize calendar
         self._calendar = Calendar(self.locale.first_day_of_week)
+        self.stats: Counter[str] = Counter()
+        self.hooks: List[StageHook] = list(kwargs.get("hooks", []))
+        self.profile = RenderProfile(self.hooks)
+        self.measure_peak_memory: bool = kwargs.get("measure_peak_memory", False)
+
+        # Classify all days of the year right away
+        self._day_categories = self._make_day_categories()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._DAY_CATEGORY_SOURCES:
+            # Classified again when needed
+            self.__dict__["_day_categories"] = None
+        super().__setattr__(name, value)
 
     def _repr_html_(self):
-        """HTML representation, useful for IPython notebook."""
+        """HTML representation with proofs of all pages, useful for IPython notebook.
+
+        Without all pictures, only thumbnails of the available ones are shown.
+        """
         from io import BytesIO
         from base64 import b64encode
 
+        from .preview import render_proofs
+
         html = "<div>"
-        html += "<div style='font-size:124%'>Calendar for year {0}</div>".format(
-            self.year
-        )
+        html += "<div style='font-size:124%'>Calendar for year {0}</div>".format(self.year)
         html += "<div>"
-        thumb_size = 64
-        for i, image in enumerate(self.pictures):
-            pil_im = PIL.Image.open(image)
-            pil_im = self._scale_picture(pil_im, 1)[0]
-            pil_im.thumbnail((thumb_size, thumb_size))
+        try:
+            pages = render_proofs(self, dpi=24)
+        except (LookupError, OSError):
+            # Not all pictures available (e.g. none yet), show the ones that are
+            pages = []
+            thumb_size = 64
+            for i, image in enumerate(self.pictures):
+                pil_im = PIL.Image.open(image)
+                pil_im = self._scale_picture(pil_im, 1)[0]
+                pil_im.thumbnail((thumb_size, thumb_size))
+                b = BytesIO()
+                pil_im.save(b, format="png")
+                image_data = b64encode(b.getvalue()).decode("utf-8")
+                html += (
+                    "<img style='display:inline-block; margin:1px' "
+                    f"alt='{i}' src='data:image/png;base64,{image_data}'/>"
+                )
+        for month, page in enumerate(pages, start=1):
             b = BytesIO()
-            pil_im.save(b, format="png")
+            page.save(b, format="png")
             image_data = b64encode(b.getvalue()).decode("utf-8")
             html += (
-                "<img style='display:inline-block; margin:1px' "
-                f"alt='{i}' src='data:image/png;base64,{image_data}'/>"
+                "<img style='display:inline-block; margin:1px; border:1px solid #ccc' "
+                f"alt='{month}' src='data:image/png;base64,{image_data}'/>"
             )
 
         html += "</div>"
         html += "</div>"
         return html
 
+    def _make_day_categories(self) -> DayCategories:
+        return DayCategories(self.year, self.locale.weekend, self.holidays, self.special_days)
+
+    @property
+    def day_categories(self) -> DayCategories:
+        """Weekend, holiday and special day flags of all days in the year.
+
+        Computed once and again only after the year, locale, holidays
+        or special days are set. (Collections modified in place
+        must be set again, e.g. `calendar.special_days = days`.)
+        """
+        if self._day_categories is None:
+            self._day_categories = self._make_day_categories()
+        return self._day_categories
+
     @property
     def width(self):
         return self.pagesize[0]
@@ -179,167 +358,361 @@ class YearCalendar(object):
         font = font_loader.get_font_name(name, variant)
         self.canvas.setFont(font, size)
 
-    def _style_holidays_and_special_days(self, month, table_style):
-        """Set colours for all cells based on categories.
+    def _day_colors(self, month) -> CellColors:
+        """Colours of the cells based on categories of their days.
 
-        Categories: weekend, holidays, special days.
+        Categories: weekend, holidays, special days (in increasing priority).
+        Only cells that differ from ordinary week days are included.
         """
+        cell_colors: CellColors = {}
+        day_categories = self.day_categories
         calendar = self._calendar.monthdatescalendar(self.year, month)
         for row, days in enumerate(calendar):
             for column, day in enumerate(days):
                 if day.month != month:
                     continue
-                if day.weekday() in self.locale.weekend:
-                    table_style.add(
-                        "BACKGROUND", (column, row), (column, row), self.weekend_bgcolor
-                    )
-                    table_style.add(
-                        "TEXTCOLOR", (column, row), (column, row), self.weekend_color
-                    )
-                if day in self.holidays:
-                    table_style.add(
-                        "BACKGROUND", (column, row), (column, row), self.holiday_bgcolor
-                    )
-                    table_style.add(
-                        "TEXTCOLOR", (column, row), (column, row), self.holiday_color
-                    )
-                if day in self.special_days:
-                    table_style.add(
-                        "BACKGROUND",
-                        (column, row),
-                        (column, row),
-                        self.special_day_bgcolor,
-                    )
-                    table_style.add(
-                        "TEXTCOLOR",
-                        (column, row),
-                        (column, row),
-                        self.special_day_color,
-                    )
+                flags = day_categories[day]
+                if flags & SPECIAL_DAY:
+                    cell_colors[column, row] = (self.special_day_bgcolor, self.special_day_color)
+                elif flags & HOLIDAY:
+                    cell_colors[column, row] = (self.holiday_bgcolor, self.holiday_color)
+                elif flags & WEEKEND:
+                    cell_colors[column, row] = (self.weekend_bgcolor, self.weekend_color)
+        return cell_colors
 
-    def _scale_picture(
-        self, image, max_picture_height: float
-    ) -> tuple[Any, float, float]:
-        """Apply the scaling algorithm.
+    def _style_holidays_and_special_days(self, month, table_style):
+        """Set colours for all cells based on categories.
+
+        Categories: weekend, holidays, special days.
+        """
+        for cell, (bgcolor, color) in self._day_colors(month).items():
+            table_style.add("BACKGROUND", cell, cell, bgcolor)
+            table_style.add("TEXTCOLOR", cell, cell, color)
 
-        :param image: PIL object
+    def _scaling_geometry(
+        self, size: tuple[int, int], max_picture_height: float
+    ) -> tuple[Optional[tuple[int, int, int, int]], tuple[int, int]]:
+        """Compute how an image of a given size is transformed by the scaling algorithm.
+
+        :param size: (width, height) of the source image in pixels
         :max_picture_height: the vertical area that can be occupied (in points)
 
-        Return tuple (transformed PIL image object, width in points, height in points)
+        Return tuple (crop box in pixels or None, target size in pixels)
         """
         # Current dimensions in pixels
-        width, height = image.size
+        width, height = size
 
         # Max dimensions in pixels
         max_width_px = self.content_width * self.image_dpi / 72
         max_height_px = max_picture_height * self.image_dpi / 72
 
-        if self.scaling == "squarecrop":
+        # The position of smartcrop's box depends on the content, see _scale_picture
+        if self.scaling in ("squarecrop", "smartcrop"):
             crop_size = min(width, height)
-            crop_coords = (
+            crop_box: Optional[tuple[int, int, int, int]] = (
                 (width - crop_size) // 2,
                 (height - crop_size) // 2,
                 (width - crop_size) // 2 + crop_size,
                 (height - crop_size) // 2 + crop_size,
             )
-            image = image.crop(crop_coords)
             max_side_px = int(min(max_width_px, max_height_px))
             target_size_px = (max_side_px, max_side_px)
 
         elif self.scaling == "fit":
+            crop_box = None
             if width * max_height_px > height * max_width_px:
-                height = max_width_px * height / width
-                width = max_width_px
+                target_size_px = (int(max_width_px), int(max_width_px * height / width))
             else:
-                width = max_height_px * width / height
-                height = max_height_px
-
-            target_size_px = (int(width), int(height))
+                target_size_px = (int(max_height_px * width / height), int(max_height_px))
 
         else:
             raise ValueError(f"Unknown scaling: {self.scaling}")
 
+        return crop_box, target_size_px
+
+    def _scale_picture(
+        self, image, max_picture_height: float, month: Optional[int] = None
+    ) -> tuple[Any, float, float]:
+        """Apply the scaling algorithm.
+
+        The target size is computed first so that JPEG images are decoded
+        only at the smallest scale still large enough (see Image.draft)
+        and other images are reduced before the final resampling.
+
+        :param image: PIL object (preferably not loaded yet)
+        :max_picture_height: the vertical area that can be occupied (in points)
+        :param month: Month to account the timings to (see profile)
+
+        Return tuple (transformed PIL image object, width in points, height in points)
+        """
+        crop_box, target_size_px = self._scaling_geometry(image.size, max_picture_height)
+
+        with self.profile.measure("decode", month):
+            # Ask the decoder for a reduced-scale image if the target allows it
+            crop_width = crop_box[2] - crop_box[0] if crop_box else image.size[0]
+            factor = target_size_px[0] / crop_width
+            if factor < 1:
+                original_size = image.size
+                image.draft(
+                    image.mode,
+                    (math.ceil(original_size[0] * factor), math.ceil(original_size[1] * factor)),
+                )
+                if image.size != original_size:
+                    logging.debug(f"Picture decoded at {image.size} instead of {original_size}.")
+                    crop_box, _ = self._scaling_geometry(image.size, max_picture_height)
+            image.load()
+        self.profile.count("pixels_decoded", image.size[0] * image.size[1])
+
+        if self.scaling == "smartcrop":
+            with self.profile.measure("crop", month):
+                crop_box = find_crop_box(image, target_size_px[0] / target_size_px[1])
+
         # Scale the image itself
-        image = image.resize(target_size_px)
+        with self.profile.measure("scale", month):
+            image = image.resize(target_size_px, self.resample, box=crop_box, reducing_gap=3.0)
 
         # Compute the dimensions for PDF
         target_size = [size / self.image_dpi * 72 for size in target_size_px]
 
         return image, target_size[0], target_size[1]
 
-    def _render_picture(self, month, max_picture_height):
-        """Draw the picture.
+    def _picture_height(self, month: int) -> float:
+        """Vertical area available for the picture of a month (in points)."""
+        weeks = len(self._calendar.monthdayscalendar(self.year, month))
+        table_height = sum((self.cell_height,) * weeks)
+        return self.content_height - self.title_font_size - 2 * self.title_margin - table_height
 
-        It is automatically scaled using the selected algorithm.
-        """
-        image = PIL.Image.open(self.pictures[month])
-        image, width, height = self._scale_picture(image, max_picture_height)
-        left = (self.content_width - width) / 2 + self.margins[3]
-        top = self.content_height + self.margins[0] - height
+    def min_picture_size(self, aspect_ratio: Optional[float] = None) -> tuple[int, int]:
+        """Smallest (width, height) in pixels of a picture that is never upscaled.
 
-        self.canvas.drawImage(ImageReader(image), left, top, width=width, height=height)
+        Computed for the largest picture area of all months. For the "fit"
+        scaling, a picture fills only one dimension of the area, which one
+        depends on its aspect ratio. Without it, the size covering the whole
+        area is returned (enough for any aspect ratio, but more than needed).
 
-    def _render_month(self, month):
-        """Render one page with a month."""
+        :param aspect_ratio: Width / height of the picture
+        """
+        max_width_px = self.content_width * self.image_dpi / 72
+        max_height_px = (
+            max(self._picture_height(month) for month in range(1, 13)) * self.image_dpi / 72
+        )
+        if self.scaling in ("squarecrop", "smartcrop"):
+            side = int(min(max_width_px, max_height_px))
+            return side, side
+        if aspect_ratio is None:
+            return int(max_width_px), int(max_height_px)
+        # The same condition as in _scaling_geometry
+        if aspect_ratio * max_height_px > max_width_px:
+            return int(max_width_px), int(max_width_px / aspect_ratio)
+        return int(max_height_px * aspect_ratio), int(max_height_px)
+
+    def _is_passthrough(self, image, crop_box, target_size_px) -> bool:
+        """Whether the source JPEG can be embedded as it is.
+
+        This is the case when no resampling or cropping is necessary
+        and reportlab recognizes the file as JPEG.
+        """
+        return (
+            image.format == "JPEG"
+            and image.mode in ("RGB", "L", "CMYK")
+            and os.path.splitext(image.filename)[1].lower() in (".jpg", ".jpeg")
+            and tuple(target_size_px) == image.size
+            and (crop_box is None or tuple(crop_box) == (0, 0) + image.size)
+        )
 
-        table_data = self._calendar.monthdayscalendar(self.year, month)
-        table_data = [[day or None for day in week] for week in table_data]
+    def _prepare_picture(self, month: int) -> PreparedPicture:
+        """Open and scale the picture of a month.
 
-        table = Table(
-            table_data,
-            colWidths=(self.cell_width,) * 7,
-            rowHeights=(self.cell_height,) * len(table_data),
-        )
+        This does not touch the canvas and is therefore safe to run
+        in a worker thread.
 
-        style = TableStyle()
-        for padding in ("TOP", "RIGHT", "BOTTOM", "LEFT"):
-            style.add(padding + "PADDING", (0, 0), (-1, -1), self.cell_padding)
-        for position in ("BEFORE", "AFTER", "ABOVE", "BELOW"):
-            style.add(
-                "LINE" + position, (0, 0), (-1, -1), self.cell_spacing / 2, colors.white
-            )
+        If an image cache is set, the picture is looked up there first
+        and stored there after scaling (the scaled pixels are the same
+        either way). JPEG pictures that already have
+        the target size are passed through without decoding.
+        """
+        path = self.pictures[month]
+        max_picture_height = self._picture_height(month)
+
+        cache = self.image_cache
+        key = None
+        if cache is not None:
+            with self.profile.measure("cache", month):
+                key = cache.make_key(
+                    path,
+                    scaling=self.scaling,
+                    image_dpi=self.image_dpi,
+                    max_size=(self.content_width, max_picture_height),
+                    resample=self.resample,
+                )
+                cached = cache.get(key)
+            if cached is not None:
+                width, height = [size / self.image_dpi * 72 for size in cached.size]
+                return PreparedPicture(cached, width, height, "cached")
+
+        # The source (file and decoded pixels) is released as soon as it is scaled
+        with self.profile.measure("decode", month):
+            source = PIL.Image.open(path)
+        with closing(source):
+            crop_box, target_size_px = self._scaling_geometry(source.size, max_picture_height)
+            if self._is_passthrough(source, crop_box, target_size_px):
+                width, height = [size / self.image_dpi * 72 for size in target_size_px]
+                return PreparedPicture(path, width, height, "passthrough")
+
+            image, width, height = self._scale_picture(source, max_picture_height, month)
+        if cache is not None and key is not None:
+            with self.profile.measure("cache", month):
+                cache.put(key, image)
+        return PreparedPicture(image, width, height)
+
+    def _prepare_pictures(
+        self,
+        workers: Optional[int] = None,
+        prepare: Optional[Callable[[int], PreparedPicture]] = None,
+    ) -> Iterator[PreparedPicture]:
+        """Prepare pictures for all months, in the order of months.
+
+        :param workers: Number of threads to scale the pictures in
+            (None or 1 => serially, as they are needed). At most this many
+            pictures are prepared ahead of the one being drawn.
+        :param prepare: Function preparing the picture of a month
+            (default: _prepare_picture)
+        """
+        prepare = prepare or self._prepare_picture
+        months = range(1, 13)
+        if not workers or workers <= 1:
+            yield from (prepare(month) for month in months)
+        else:
+            # Pillow releases GIL while decoding and resampling, threads are enough
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending: deque = deque()
+                for month in months:
+                    if len(pending) >= workers:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(prepare, month))
+                while pending:
+                    yield pending.popleft().result()
+
+    def _encode_picture(self, picture: PreparedPicture, month: Optional[int] = None):
+        """Convert a prepared picture to a PDF image object (compressed stream).
+
+        The object can be drawn into any number of documents (see MultiCalendar)
+        without compressing the picture again. The pixels are freed.
+        """
+        image = picture.image
+        if isinstance(image, PDFImageXObject):
+            return picture
+        with self.profile.measure("embed", month):
+            if isinstance(image, str):
+                # Named the same way as by canvas.drawImage
+                xobject = PDFImageXObject(_digester(f"{image}None".encode("utf-8")), image)
+            else:
+                with closing(image):
+                    reader = ImageReader(image)
+                    xobject = PDFImageXObject(_digester(reader.getRGBData() + b"None"), reader)
+        return picture._replace(image=xobject)
+
+    def _draw_xobject(self, xobject: PDFImageXObject, left, top, width, height):
+        """Draw an already encoded picture (as canvas.drawImage does with a new one)."""
+        doc = self.canvas._doc
+        registered_name = doc.getXObjectName(xobject.name)
+        if registered_name not in doc.idToObject:
+            # A document marks the objects registered in it, each gets its own (shallow) copy
+            doc.addForm(xobject.name, copy.copy(xobject))
+        self.canvas._currentPageHasImages = 1
+        self.canvas.saveState()
+        self.canvas.translate(left, top)
+        self.canvas.scale(width, height)
+        self.canvas._code.append(f"/{registered_name} Do")
+        self.canvas.restoreState()
+        self.canvas._formsinuse.append(xobject.name)
+
+    def _render_picture(self, picture: PreparedPicture, month: Optional[int] = None):
+        """Draw the (already scaled) picture."""
+        image, width, height, origin = picture
+        left = (self.content_width - width) / 2 + self.margins[3]
+        top = self.content_height + self.margins[0] - height
 
-        font_name = font_loader.get_font_name(
-            self.cell_font_name, self.cell_font_variant
+        with self.profile.measure("embed", month):
+            if isinstance(image, PDFImageXObject):
+                self._draw_xobject(image, left, top, width, height)
+            elif isinstance(image, str):
+                # JPEG files are embedded by reportlab as they are
+                self.canvas.drawImage(image, left, top, width=width, height=height)
+            else:
+                # Only the compressed stream is kept in the document, free the pixels
+                with closing(image):
+                    self.canvas.drawImage(ImageReader(image), left, top, width=width, height=height)
+        self.profile.count(
+            "pixels_embedded",
+            round(width * self.image_dpi / 72) * round(height * self.image_dpi / 72),
+        )
+        self.stats[origin] += 1
+
+    def _month_layout(self) -> MonthLayout:
+        """Layout of the day grid."""
+        font_name = font_loader.get_font_name(self.cell_font_name, self.cell_font_variant)
+        return MonthLayout(
+            self.cell_width,
+            self.cell_height,
+            self.cell_padding,
+            self.cell_spacing,
+            font_name,
+            self.cell_font_size,
+            self.week_color,
+            self.week_bgcolor,
         )
-        style.add("FONT", (0, 0), (-1, -1), font_name, self.cell_font_size)
-        style.add("ALIGN", (0, 0), (-1, -1), "RIGHT")
-        style.add("VALIGN", (0, 0), (-1, -1), "MIDDLE")
-        style.add("BACKGROUND", (0, 0), (-1, -1), self.week_bgcolor)
-        style.add("TEXTCOLOR", (0, 0), (-1, -1), self.week_color)
 
-        self._style_holidays_and_special_days(month, style)
+    def _render_month(self, month, picture: Optional[PreparedPicture] = None):
+        """Render one page with a month.
 
-        table.setStyle(style)
-        table_width, table_height = table.wrapOn(
-            self.canvas, 7 * self.cell_width, 6 * self.cell_height
-        )
-        table.drawOn(self.canvas, self.margins[3], self.margins[2])
+        :param picture: Result of _prepare_picture (prepared here if not provided)
+        """
+
+        table_data: List[List[Optional[int]]] = [
+            [day or None for day in week]
+            for week in self._calendar.monthdayscalendar(self.year, month)
+        ]
+
+        with self.profile.measure("grid", month):
+            layout = self._month_layout()
+            if self.grid_renderer == "table":
+                style = layout.make_style(self._day_colors(month))
+                table = layout.make_table(table_data, style)
+                table_width, table_height = table.wrapOn(
+                    self.canvas, 7 * self.cell_width, 6 * self.cell_height
+                )
+                table.drawOn(self.canvas, self.margins[3], self.margins[2])
+            elif self.grid_renderer == "canvas":
+                table_height = layout.draw(
+                    self.canvas,
+                    self.margins[3],
+                    self.margins[2],
+                    table_data,
+                    self._day_colors(month),
+                )
+            else:
+                raise ValueError(f"Unknown grid renderer: {self.grid_renderer}")
 
         # Render title
-        title_position = (
-            self.margins[3],
-            self.margins[2] + table_height + self.title_margin,
-        )
-        self.set_font(
-            self.title_font_name, self.title_font_size, variant=self.title_font_variant
-        )
-        self.canvas.drawString(
-            title_position[0],
-            title_position[1],
-            self.locale.get_month_title(
-                self.year, month, self.include_year_in_month_name
-            ),
-        )
+        with self.profile.measure("title", month):
+            title_position = (
+                self.margins[3],
+                self.margins[2] + table_height + self.title_margin,
+            )
+            self.set_font(
+                self.title_font_name, self.title_font_size, variant=self.title_font_variant
+            )
+            self.canvas.drawString(
+                title_position[0],
+                title_position[1],
+                self.locale.get_month_title(self.year, month, self.include_year_in_month_name),
+            )
 
         # Render picture
-        self._render_picture(
-            month,
-            self.content_height
-            - self.title_font_size
-            - 2 * self.title_margin
-            - table_height,
-        )
+        if picture is None:
+            picture = self._prepare_picture(month)
+        self._render_picture(picture, month)
         self.canvas.showPage()
 
     def render_title_page(self):
@@ -347,15 +720,121 @@ class YearCalendar(object):
         # self.canvas.showPage()
         pass
 
-    def render(self, file_name):
-        """Render the calendar into a PDF file.
+    def draw_pages(
+        self,
+        pdf_canvas: canvas.Canvas,
+        pictures: Optional[Iterable[PreparedPicture]] = None,
+        workers: Optional[int] = None,
+    ):
+        """Draw all pages of the calendar onto a canvas (without saving it).
 
-        :param file_name: Path to write to.
+        :param pictures: Prepared pictures of all months in order
+            (default: prepared here, see _prepare_pictures)
+        :param workers: Number of threads preparing the pictures (see render)
         """
-        self.canvas = canvas.Canvas(file_name, self.pagesize)
-        self.canvas.setTitle("{0} {1}".format(self.locale.calendar_name, self.year))
+        self.canvas = pdf_canvas
         self.render_title_page()  # TODO: To be implemented
-        for month in range(1, 13):
+        if pictures is None:
+            pictures = self._prepare_pictures(workers)
+        for month, picture in enumerate(pictures, start=1):
+            self._render_month(month, picture)
             logging.info("Page {0} rendered.".format(month))
-            self._render_month(month)
-        self.canvas.save()
+
+    def render(self, output: Union[str, os.PathLike, IO[bytes]], workers: Optional[int] = None):
+        """Render the calendar into a PDF file.
+
+        :param output: Path to write to or a binary file-like object
+            (e.g. sys.stdout.buffer or an HTTP response). The document is
+            written in one go when all pages are complete.
+        :param workers: Number of threads preparing the pictures in parallel
+            (default: None => one by one). The pages are always drawn
+            in order in the main thread, the output does not depend on this.
+        """
+        self._render(output, self._prepare_pictures(workers))
+
+    def render_incremental(self, path: str, workers: Optional[int] = None) -> List[int]:
+        """Render the calendar into a PDF file, reusing the pictures of the last rendering.
+
+        Only the pictures whose inputs changed since the file was rendered
+        (by this method) are prepared again, see the incremental module.
+
+        :param path: The PDF file, the manifest is stored next to it
+        :param workers: Number of threads preparing the pictures in parallel
+        :returns: Months whose pages changed (if none, the file is not written)
+        """
+        fingerprints = incremental.page_fingerprints(self)
+        manifest, pdf_data = incremental.RenderManifest.load(path)
+        old_pages = manifest.pages if manifest else {}
+        changed = [
+            month
+            for month, (fingerprint, _) in fingerprints.items()
+            if month not in old_pages or old_pages[month].fingerprint != fingerprint
+        ]
+        if manifest and not changed:
+            logging.info(f"Calendar {path} is up to date.")
+            return []
+
+        reused: Dict[int, PreparedPicture] = {}
+        offsets = incremental.object_offsets(pdf_data) if pdf_data else {}
+        for month, (_, picture_fingerprint) in fingerprints.items():
+            page = old_pages.get(month)
+            if page and page.image and page.picture_fingerprint == picture_fingerprint:
+                xobject = incremental.read_image(pdf_data, offsets, page.image)
+                if xobject is not None:
+                    reused[month] = PreparedPicture(xobject, *page.picture_size, "reused")
+        del pdf_data
+
+        drawn: Dict[int, PreparedPicture] = {}
+
+        def prepare(month: int) -> PreparedPicture:
+            picture = reused.get(month) or self._encode_picture(self._prepare_picture(month), month)
+            drawn[month] = picture
+            return picture
+
+        pdf_canvas = self._render(path, self._prepare_pictures(workers, prepare))
+        logging.info(
+            f"Pages changed: {', '.join(map(str, changed))} ({len(reused)} pictures reused)."
+        )
+
+        doc = pdf_canvas._doc
+        pages = {}
+        for month, picture in drawn.items():
+            xobject = picture.image
+            number, _ = doc.idToObjectNumberAndVersion[doc.getXObjectName(xobject.name)]
+            pages[month] = incremental.PageEntry(
+                *fingerprints[month],
+                (picture.width, picture.height),
+                incremental.image_entry(xobject, number),
+            )
+        with open(path, "rb") as f:
+            pdf_sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        incremental.RenderManifest(os.path.getsize(path), pdf_sha256, pages).save(path)
+        return changed
+
+    def _render(self, output, pictures: Iterable[PreparedPicture]) -> canvas.Canvas:
+        """Render the calendar with the given pictures, return the saved canvas."""
+        start = time.perf_counter()
+        if self.measure_peak_memory:
+            reset_peak_memory()
+        self.stats = Counter()
+        self.profile = RenderProfile(self.hooks)
+        writer = _OutputWriter(output)
+        pdf_canvas = canvas.Canvas(writer, self.pagesize, invariant=self.invariant)
+        pdf_canvas.setTitle("{0} {1}".format(self.locale.calendar_name, self.year))
+        self.draw_pages(pdf_canvas, pictures)
+        try:
+            with self.profile.measure("save"):
+                pdf_canvas.save()
+        finally:
+            writer.close()
+        self.profile.count("bytes_written", writer.bytes_written)
+        self.profile.total = time.perf_counter() - start
+        logging.info(f"Calendar written to {writer.name} ({writer.bytes_written} bytes).")
+        self.stats["peak_memory"] = peak_memory()
+        logging.info(
+            "Pictures: {0} scaled, {1} from cache, {2} passed through.".format(
+                self.stats["scaled"], self.stats["cached"], self.stats["passthrough"]
+            )
+        )
+        logging.info(f"Peak memory: {self.stats['peak_memory'] / 2**20:.1f} MiB.")
+        return pdf_canvas
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+from PIL import Image
+
+
+def make_picture(size, seed: int = 0) -> Image.Image:
+    """Synthetic RGB picture with some detail (different for each seed)."""
+    width, height = size
+    extent = (-2.0 + seed * 0.02, -1.2, 0.8 + seed * 0.02, 1.2)
+    detail = Image.effect_mandelbrot(size, extent, 32)
+    horizontal = Image.linear_gradient("L").rotate(90).resize(size)
+    radial = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", (horizontal, radial, detail))
+
+
+@pytest.fixture(scope="session")
+def picture_dir(tmp_path_factory) -> str:
+    """Directory with 12 JPEG pictures 1.jpg ... 12.jpg (see SortedImageDirectory)."""
+    directory = tmp_path_factory.mktemp("pictures")
+    for month in range(1, 13):
+        make_picture((480, 360), month).save(directory / f"{month}.jpg", quality=90)
+    return os.fspath(directory)
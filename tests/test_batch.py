@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+from reportlab import rl_config
+
+from pyearcal.batch import load_manifest, render_batch
+from pyearcal.cli import run
+
+
+@pytest.fixture(autouse=True)
+def invariant(monkeypatch):
+    """Output without the time of rendering (so that it can be compared)."""
+    monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+def test_batch_matches_render(picture_dir, tmp_path):
+    special_days = tmp_path / "special_days.txt"
+    special_days.write_text("1, 31\n")
+    result = CliRunner().invoke(
+        run,
+        [
+            str(tmp_path / "render.pdf"),
+            *("-s", picture_dir, "--sorted", "-l", "cs", "-y", "2026"),
+            *("--image-dpi", "36", "-d", str(special_days)),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    job = {
+        "source": picture_dir,
+        "sorted": True,
+        "locale": "cs",
+        "year": 2026,
+        "image_dpi": 36,
+        "special_days": ["2026-01-31"],
+    }
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({**job, "output": str(tmp_path / "batch.pdf")})
+        + "\n\n"
+        + json.dumps({**job, "output": str(tmp_path / "cached.pdf")})
+        + "\n"
+    )
+    jobs = load_manifest(str(manifest))
+    assert len(jobs) == 2
+    results = list(render_batch(jobs[:1], workers=1))
+    results += render_batch(jobs[1:], workers=1, cache_dir=str(tmp_path / "cache"))
+    assert [result.error for result in results] == [None, None]
+
+    expected = (tmp_path / "render.pdf").read_bytes()
+    assert (tmp_path / "batch.pdf").read_bytes() == expected
+    assert (tmp_path / "cached.pdf").read_bytes() == expected
+
+
+def test_failed_job_does_not_stop_batch(picture_dir, tmp_path):
+    jobs = [
+        {"output": str(tmp_path / "missing.pdf"), "source": str(tmp_path / "missing")},
+        {"output": str(tmp_path / "ok.pdf"), "source": picture_dir, "image_dpi": 18},
+    ]
+    results = list(render_batch(jobs, workers=1))
+    assert results[0].error is not None
+    assert results[1].error is None
+    assert (tmp_path / "ok.pdf").exists()
+
+
+def test_render_reports_missing_pictures(picture_dir, tmp_path):
+    output = tmp_path / "calendar.pdf"
+    result = CliRunner().invoke(run, [str(output), "-s", str(tmp_path / "missing")])
+    assert result.exit_code == 2
+    assert "--source" in result.output
+
+    # 12.jpg is missing in a sorted directory
+    (tmp_path / "pictures").mkdir()
+    for month in range(1, 12):
+        (tmp_path / "pictures" / f"{month}.jpg").symlink_to(f"{picture_dir}/{month}.jpg")
+    result = CliRunner().invoke(run, [str(output), "-s", str(tmp_path / "pictures"), "--sorted"])
+    assert result.exit_code == 2
+    assert "--source" in result.output and "12.jpg" in result.output
+    assert not output.exists()
@@ -0,0 +1,78 @@
+import os
+from collections import OrderedDict
+
+from PIL import Image
+from reportlab.lib.pagesizes import A6
+
+from pyearcal.cache import ImageCache
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.year_calendar import YearCalendar
+
+
+def render(picture_dir, path, **kwargs) -> YearCalendar:
+    calendar = YearCalendar(
+        2026, SortedImageDirectory(picture_dir), pagesize=A6, invariant=True, **kwargs
+    )
+    calendar.render(path)
+    return calendar
+
+
+def test_second_render_hits_cache(picture_dir, tmp_path):
+    cache = ImageCache(str(tmp_path / "cache"))
+
+    first = render(picture_dir, tmp_path / "first.pdf", image_cache=cache)
+    assert first.stats["scaled"] == 12
+    assert first.stats["cached"] == 0
+
+    second = render(picture_dir, tmp_path / "second.pdf", image_cache=cache)
+    assert second.stats["cached"] == 12
+    assert second.stats["scaled"] == 0
+    # The sources are not decoded at all
+    assert second.profile.counters.get("pixels_decoded", 0) == 0
+
+
+def test_cache_does_not_change_output(picture_dir, tmp_path):
+    cache = ImageCache(str(tmp_path / "cache"))
+    render(picture_dir, tmp_path / "plain.pdf")
+    render(picture_dir, tmp_path / "miss.pdf", image_cache=cache)
+    render(picture_dir, tmp_path / "hit.pdf", image_cache=cache)
+
+    plain = (tmp_path / "plain.pdf").read_bytes()
+    assert (tmp_path / "miss.pdf").read_bytes() == plain
+    assert (tmp_path / "hit.pdf").read_bytes() == plain
+
+
+def test_eviction(picture_dir, tmp_path):
+    cache = ImageCache(str(tmp_path / "cache"), max_size=1)
+    render(picture_dir, tmp_path / "calendar.pdf", image_cache=cache)
+    # Only the most recent entry may exceed the limit
+    assert len(list((tmp_path / "cache").iterdir())) <= 1
+
+
+def test_digests_are_bounded(picture_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(ImageCache, "DIGEST_CACHE_SIZE", 4)
+    monkeypatch.setattr(ImageCache, "_digests", OrderedDict())
+    cache = ImageCache(str(tmp_path / "cache"))
+    for month in range(1, 13):
+        cache.make_key(os.path.join(picture_dir, f"{month}.jpg"))
+    assert len(ImageCache._digests) == 4
+    # The least recently used are forgotten
+    assert [os.path.basename(path) for path, _, _ in ImageCache._digests] == [
+        f"{month}.jpg" for month in range(9, 13)
+    ]
+
+
+def test_directory_scanned_only_when_full(tmp_path, monkeypatch):
+    cache = ImageCache(str(tmp_path / "cache"), max_size=100 * 1024)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    image = Image.effect_noise((32, 32), 64).convert("RGB")
+    for index in range(100):
+        cache.put(f"key{index}", image)
+    sizes = [path.stat().st_size for path in (tmp_path / "cache").iterdir()]
+    assert sum(sizes) <= 100 * 1024
+    # The first scan and one whenever the stored files exceed the limit,
+    # i.e. after each (1 - EVICT_TO) * max_size of new files
+    assert len(scans) <= 1 + 100 * max(sizes) // (25 * 1024) + 1
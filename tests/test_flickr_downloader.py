@@ -0,0 +1,117 @@
+import http.server
+import os
+import socket
+import threading
+from collections import Counter
+from typing import Dict
+
+import pytest
+
+pytest.importorskip("bs4")
+requests = pytest.importorskip("requests")
+
+from pyearcal import flickr_downloader  # noqa: E402
+from pyearcal.flickr_downloader import FlickrDownloader, is_valid_image  # noqa: E402
+
+
+class BrokenResponse(object):
+    """Streamed response failing in the middle."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield b"\xff\xd8\xff"
+        raise requests.ConnectionError("Connection reset")
+
+
+def test_failed_download_leaves_no_file(tmp_path, monkeypatch):
+    # Nothing is downloaded when created
+    monkeypatch.setattr(FlickrDownloader, "download_images", lambda self: None)
+    downloader = FlickrDownloader(dirname=str(tmp_path))
+    monkeypatch.setattr(downloader.session, "get", lambda *args, **kwargs: BrokenResponse())
+    with pytest.raises(requests.ConnectionError):
+        downloader.download_image("https://example.com/1.jpg", str(tmp_path / "1.jpg"))
+    assert list(tmp_path.iterdir()) == []
+
+
+class FlakyPictures(http.server.BaseHTTPRequestHandler):
+    """Stand-in of the flickr feed and pictures (see the flickr_url fixture).
+
+    /drop-once/* drops the connection in the middle of the first response,
+    /drop/* in the middle of every one.
+    """
+
+    pictures: Dict[str, bytes] = {}
+    counts: Counter = Counter()
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        self.counts[path] += 1
+        if path == "/feed":
+            host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+            items = "".join(f'<media:content url="{host}/{name}"/>' for name in self.pictures)
+            body = f"<rss><channel>{items}</channel></rss>".encode("utf-8")
+        else:
+            body = self.pictures[path[1:]]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if path.startswith("/drop/") or (path.startswith("/drop-once/") and self.counts[path] == 1):
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flickr_url(picture_dir):
+    with open(os.path.join(picture_dir, "1.jpg"), "rb") as f:
+        picture = f.read()
+    FlakyPictures.pictures = {
+        "ok/1.jpg": picture,
+        "drop-once/2.jpg": picture,
+        "drop/3.jpg": picture,
+    }
+    FlakyPictures.counts = Counter()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyPictures)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_download_retries_and_skips_failed(tmp_path, monkeypatch, flickr_url):
+    monkeypatch.setattr(flickr_downloader, "BACKOFF", 0)
+    with monkeypatch.context() as patch:
+        # Nothing is downloaded when created
+        patch.setattr(FlickrDownloader, "download_images", lambda self: None)
+        downloader = FlickrDownloader(
+            dirname=str(tmp_path), feed_url=f"{flickr_url}/feed", retries=2
+        )
+
+    downloader.download_images(3)
+
+    # The interrupted picture was downloaded again, the broken one skipped
+    assert FlakyPictures.counts["/drop-once/2.jpg"] == 2
+    assert FlakyPictures.counts["/drop/3.jpg"] == 3
+    assert len(downloader.failed) == 1
+    downloaded = sorted(path.name for path in tmp_path.iterdir())
+    assert downloaded == sorted(
+        f"{index}.jpg" for index in (1, 2, 3) if index not in downloader.failed
+    )
+    assert all(is_valid_image(str(tmp_path / name)) for name in downloaded)
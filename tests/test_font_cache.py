@@ -0,0 +1,60 @@
+import os
+from io import BytesIO
+
+import pytest
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from pyearcal import font_cache
+
+FONT_PATH = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+
+TEXT = "Leden 2026, Příliš žluťoučký kůň"
+
+
+def render(font: TTFont) -> bytes:
+    pdfmetrics.registerFont(font)
+    output = BytesIO()
+    pdf = canvas.Canvas(output, invariant=1)
+    pdf.setFont(font.fontName, 12)
+    pdf.drawString(72, 72, TEXT)
+    pdf.showPage()
+    pdf.save()
+    return output.getvalue()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(font_cache, "default_font_cache_dir", lambda: os.fspath(tmp_path))
+    font_cache.clear()
+    yield tmp_path
+    font_cache.clear()
+
+
+@pytest.mark.parametrize("stored", [False, True], ids=["parsed", "from stored metrics"])
+def test_cached_font_same_as_plain(cache_dir, stored):
+    if stored:
+        font_cache.make_font("Cached", FONT_PATH)
+        font_cache.clear()
+    cached = font_cache.make_font("Cached", FONT_PATH)
+    assert isinstance(cached, font_cache.CachedTTFont)
+    assert os.listdir(cache_dir)
+    plain = TTFont("Plain", FONT_PATH)
+
+    assert cached.stringWidth(TEXT, 12) == plain.stringWidth(TEXT, 12)
+    assert [cached.face.getCharWidth(ord(c)) for c in TEXT] == [
+        plain.face.getCharWidth(ord(c)) for c in TEXT
+    ]
+    # The same name, so that the documents can be the same
+    assert render(font_cache.make_font("Vera-Test", FONT_PATH)) == render(
+        TTFont("Vera-Test", FONT_PATH)
+    )
+
+
+def test_unsupported_reportlab(cache_dir, monkeypatch):
+    monkeypatch.setattr(reportlab, "Version", "99.0.0")
+    font = font_cache.make_font("Uncached", FONT_PATH)
+    assert type(font) is TTFont
+    assert not os.listdir(cache_dir)
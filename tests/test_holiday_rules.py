@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from pyearcal.l10n.italian import ItalianLocale
+from pyearcal.l10n.rules import HolidayRules
+
+
+@pytest.mark.parametrize(
+    "month, weekday, nth, expected",
+    [
+        (11, 3, 4, [date(2025, 11, 27), date(2026, 11, 26), date(2027, 11, 25)]),
+        (5, 0, -1, [date(2025, 5, 26), date(2026, 5, 25), date(2027, 5, 31)]),
+        (9, 0, 1, [date(2025, 9, 1), date(2026, 9, 7), date(2027, 9, 6)]),
+        (3, 6, -4, [date(2025, 3, 9), date(2026, 3, 8), date(2027, 3, 7)]),
+    ],
+)
+def test_nth_weekday(month, weekday, nth, expected):
+    rules = HolidayRules([{"name": "Holiday", "month": month, "weekday": weekday, "nth": nth}])
+    assert rules.evaluate_range(2025, 2027) == {
+        year: [day] for year, day in zip(range(2025, 2028), expected, strict=True)
+    }
+    # Evaluated per year (from the remembered years) the same
+    assert [rules.evaluate(year) for year in range(2025, 2028)] == [[day] for day in expected]
+
+
+def test_nth_weekday_limited_to_years():
+    rules = HolidayRules([{"name": "Holiday", "month": 1, "weekday": 0, "nth": 3, "from": 2026}])
+    assert rules.evaluate_range(2025, 2026) == {2025: [], 2026: [date(2026, 1, 19)]}
+
+
+def test_evaluated_years_are_not_shared():
+    rules = HolidayRules([{"name": "Holiday", "date": "01-01"}])
+    rules.evaluate(2026).append(date(2026, 1, 2))
+    assert rules.evaluate(2026) == [date(2026, 1, 1)]
+
+
+def test_regions():
+    rules = [{"name": "St. Peter & Paul", "date": "06-29", "city": ["roma"]}]
+    with pytest.raises(ValueError, match="Unknown keys city"):
+        HolidayRules(rules)
+    assert HolidayRules(rules, ["city"]).evaluate(2026, {"city": "roma"}) == [date(2026, 6, 29)]
+    assert HolidayRules(rules, ["city"]).evaluate(2026, {"city": "milano"}) == []
+    assert date(2026, 6, 29) in ItalianLocale(city="roma").get_holidays(2026)
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"name": "Typo", "date": "01-01", "form": 2016},
+        {"name": "No date"},
+        {"name": "Two dates", "date": "01-01", "easter": 1},
+        {"name": "Stray nth", "date": "01-01", "nth": 1},
+        {"name": "Invalid date", "date": "02-30"},
+        {"name": "Invalid date", "date": 101},
+        {"name": "Zeroth", "month": 1, "weekday": 0, "nth": 0},
+        {"name": "Fifth", "month": 1, "weekday": 0, "nth": 5},
+        {"name": "Weekday", "month": 1, "weekday": 7, "nth": 1},
+        {"name": "Month", "month": 13, "weekday": 0, "nth": 1},
+        {"name": "Easter", "easter": "1"},
+        {"name": "Years", "date": "01-01", "from": "2016"},
+        {"name": "Region", "date": "01-01", "city": "roma"},
+    ],
+)
+def test_invalid_rules(rule):
+    with pytest.raises(ValueError):
+        HolidayRules([rule], ["city"])
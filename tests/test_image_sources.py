@@ -0,0 +1,26 @@
+import os
+
+from pyearcal.image_sources import ImageSource, SortedImageDirectory
+
+
+class LegacySource(ImageSource):
+    """Source written against the original base class (without calling its __init__)."""
+
+    def __init__(self, dirname):
+        self.images = {month: os.path.join(dirname, f"{month}.jpg") for month in range(1, 13)}
+
+
+class ResolvingSource(ImageSource):
+    def __init__(self, dirname):
+        self.dirname = dirname
+
+    def _resolve(self, index):
+        return os.path.join(self.dirname, f"{index}.jpg")
+
+
+def test_sources_without_base_init(picture_dir):
+    expected = list(SortedImageDirectory(picture_dir))
+    for source in (LegacySource(picture_dir), ResolvingSource(picture_dir)):
+        assert source[3] == expected[2]
+        assert list(source) == expected
+        source.validate()
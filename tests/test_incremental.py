@@ -0,0 +1,42 @@
+import shutil
+from datetime import date
+
+import pytest
+from reportlab import rl_config
+
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.year_calendar import YearCalendar
+
+
+@pytest.fixture(autouse=True)
+def invariant(monkeypatch):
+    """Output without the time of rendering (so that it can be compared)."""
+    monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+def test_incremental_reuses_unchanged_pictures(picture_dir, tmp_path):
+    source = tmp_path / "pictures"
+    shutil.copytree(picture_dir, source)
+    output = tmp_path / "calendar.pdf"
+
+    def make_calendar(**kwargs):
+        return YearCalendar(2026, SortedImageDirectory(str(source)), image_dpi=36, **kwargs)
+
+    calendar = make_calendar()
+    assert calendar.render_incremental(str(output)) == list(range(1, 13))
+    assert calendar.stats["scaled"] == 12
+    first = output.read_bytes()
+
+    assert make_calendar().render_incremental(str(output)) == []
+    assert output.read_bytes() == first
+
+    # A new picture of March and a special day in July
+    shutil.copy(source / "5.jpg", source / "3.jpg")
+    calendar = make_calendar(special_days=[date(2026, 7, 1)])
+    assert calendar.render_incremental(str(output)) == [3, 7]
+    assert calendar.stats["reused"] == 11
+    assert calendar.stats["scaled"] == 1
+
+    full = make_calendar(special_days=[date(2026, 7, 1)])
+    full.render(tmp_path / "full.pdf")
+    assert output.read_bytes() == (tmp_path / "full.pdf").read_bytes()
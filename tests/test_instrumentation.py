@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from pyearcal.cli import run
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.instrumentation import STAGES, RenderProfile
+from pyearcal.year_calendar import YearCalendar
+
+
+def test_profile_hooks():
+    calls = []
+    profile = RenderProfile([lambda *args: calls.append(args)])
+    with profile.measure("scale", 3):
+        pass
+    profile.add("scale", 0.5, 3)
+    profile.add("save", 0.25)
+    assert [(stage, month) for stage, month, _ in calls] == [
+        ("scale", 3),
+        ("scale", 3),
+        ("save", None),
+    ]
+    assert calls[1][2] == 0.5
+    assert profile.timings["scale"][3] == calls[0][2] + 0.5
+    assert profile.stage_total("save") == 0.25
+
+
+def test_render_calls_hooks(picture_dir, tmp_path):
+    calls = []
+    calendar = YearCalendar(
+        2026,
+        SortedImageDirectory(picture_dir),
+        image_dpi=36,
+        hooks=[lambda *args: calls.append(args)],
+    )
+    calendar.render(tmp_path / "calendar.pdf")
+    for stage in ("decode", "scale", "embed", "grid", "title"):
+        assert {month for name, month, _ in calls if name == stage} == set(range(1, 13))
+    assert [month for stage, month, _ in calls if stage == "save"] == [None]
+    assert all(seconds >= 0 for _, _, seconds in calls)
+    assert calendar.profile.stage_total("grid") == pytest.approx(
+        sum(seconds for stage, _, seconds in calls if stage == "grid")
+    )
+
+
+def test_profile_json(picture_dir, tmp_path):
+    profile_json = tmp_path / "profile.json"
+    result = CliRunner().invoke(
+        run,
+        [
+            str(tmp_path / "calendar.pdf"),
+            *("-s", picture_dir, "--sorted", "--image-dpi", "36"),
+            *("--profile", "--profile-json", str(profile_json)),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "total" in result.stderr
+
+    data = json.loads(profile_json.read_text())
+    assert set(data["stages"]) <= set(STAGES)
+    assert set(data["stages"]["scale"]["months"]) == {str(month) for month in range(1, 13)}
+    assert set(data["stages"]["save"]["months"]) == {"all"}
+    assert data["total"] > 0
+    assert data["counters"]["bytes_written"] == (tmp_path / "calendar.pdf").stat().st_size
@@ -0,0 +1,78 @@
+import re
+from calendar import monthrange
+from datetime import date
+from io import BytesIO
+from typing import List, Set, Tuple
+
+import pytest
+from PIL import Image, ImageChops
+from reportlab.pdfgen import canvas
+
+from pyearcal.l10n import get_locale
+from pyearcal.year_calendar import YearCalendar
+
+# Fill colour, translation, text position and text in a page content stream
+OPERATIONS = re.compile(
+    r"(?P<rgb>[\d.]+ [\d.]+ [\d.]+) rg"
+    r"|1 0 0 1 (?P<x>[\d.-]+) (?P<y>[\d.-]+) (?P<op>Tm|cm)"
+    r"|\((?P<text>[^)]*)\) Tj"
+)
+
+
+def draw_grid(renderer: str, month: int) -> canvas.Canvas:
+    """Page with only the day grid of a month drawn by a grid renderer."""
+    calendar = YearCalendar(
+        2026, locale=get_locale("cs"), special_days=[date(2026, 3, 10)], grid_renderer=renderer
+    )
+    calendar.canvas = canvas.Canvas(BytesIO(), calendar.pagesize, pageCompression=0, invariant=1)
+    table_data: List[List] = [
+        [day or None for day in week] for week in calendar._calendar.monthdayscalendar(2026, month)
+    ]
+    layout = calendar._month_layout()
+    x, y = calendar.margins[3], calendar.margins[2]
+    if renderer == "table":
+        table = layout.make_table(table_data, layout.make_style(calendar._day_colors(month)))
+        table.wrapOn(calendar.canvas, 7 * calendar.cell_width, 6 * calendar.cell_height)
+        table.drawOn(calendar.canvas, x, y)
+    else:
+        layout.draw(calendar.canvas, x, y, table_data, calendar._day_colors(month))
+    return calendar.canvas
+
+
+def texts(pdf_canvas: canvas.Canvas) -> Set[Tuple[str, float, float, str]]:
+    """(text, x, y, colour) of all strings drawn on the current page."""
+    result = set()
+    color, offset, position = "0 0 0", (0.0, 0.0), (0.0, 0.0)
+    for match in OPERATIONS.finditer("\n".join(pdf_canvas._code)):
+        if match["rgb"]:
+            color = match["rgb"]
+        elif match["op"] == "cm":
+            offset = (float(match["x"]), float(match["y"]))
+        elif match["op"] == "Tm":
+            position = (float(match["x"]), float(match["y"]))
+        else:
+            x, y = position[0] + offset[0], position[1] + offset[1]
+            result.add((match["text"], round(x, 2), round(y, 2), color))
+    return result
+
+
+@pytest.mark.parametrize("month", [2, 3, 11])
+def test_canvas_grid_places_texts_as_table(month):
+    table_texts = texts(draw_grid("table", month))
+    assert len(table_texts) == monthrange(2026, month)[1]
+    assert texts(draw_grid("canvas", month)) == table_texts
+
+
+def rasterize(pdf_canvas: canvas.Canvas) -> Image.Image:
+    pymupdf = pytest.importorskip("pymupdf")
+    pdf_canvas.showPage()
+    pixmap = pymupdf.open(stream=pdf_canvas.getpdfdata(), filetype="pdf")[0].get_pixmap(dpi=100)
+    return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+
+@pytest.mark.parametrize("month", [2, 3, 11])
+def test_canvas_grid_looks_as_table(month):
+    table, grid = rasterize(draw_grid("table", month)), rasterize(draw_grid("canvas", month))
+    difference = ImageChops.difference(table, grid).convert("L")
+    # Only anti-aliasing of the edges may differ
+    assert difference.getextrema()[1] < 64
@@ -0,0 +1,36 @@
+from datetime import date
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A6
+
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.l10n import get_locale
+from pyearcal.multi_calendar import CalendarVariant, MultiCalendar
+from pyearcal.year_calendar import YearCalendar
+
+OPTIONS = {"pagesize": A6, "image_dpi": 72, "invariant": True}
+
+
+def test_variants_same_as_separate_calendars(picture_dir):
+    variants = [
+        CalendarVariant(2026),
+        CalendarVariant(2026, get_locale("cs"), [date(2026, 1, 31)]),
+        CalendarVariant(2027, get_locale("sk")),
+    ]
+    multi = MultiCalendar(variants, SortedImageDirectory(picture_dir), **OPTIONS)
+    outputs = [BytesIO() for _ in variants]
+    multi.render(outputs)
+    # Pictures of the same size are prepared once
+    assert multi.stats["shared"] > 0
+
+    for variant, output in zip(variants, outputs, strict=True):
+        calendar = YearCalendar(
+            variant.year,
+            SortedImageDirectory(picture_dir),
+            locale=variant.locale,
+            special_days=variant.special_days,
+            **OPTIONS,
+        )
+        expected = BytesIO()
+        calendar.render(expected)
+        assert output.getvalue() == expected.getvalue()
@@ -0,0 +1,22 @@
+import os
+
+from pyearcal.photo_library import Photo, PhotoLibrary
+
+
+def test_index_and_query(picture_dir, tmp_path):
+    library = PhotoLibrary(picture_dir, path=os.fspath(tmp_path / "photos.sqlite"))
+    assert library.update() == (12, 0)
+    # Unchanged files are not read again
+    assert library.update() == (0, 0)
+
+    photos = library.query(orientation="landscape", min_width=480)
+    assert len(photos) == 12
+    photo = photos[0]
+    assert isinstance(photo, Photo)
+    assert os.path.dirname(photo.path) == os.path.abspath(picture_dir)
+    assert (photo.width, photo.height, photo.orientation) == (480, 360, "landscape")
+    assert photo.size == os.path.getsize(photo.path)
+    assert photo.taken is None  # no EXIF date
+
+    assert library.query(orientation="portrait") == []
+    assert library.query(min_height=361) == []
@@ -0,0 +1,24 @@
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal.l10n import get_locale
+from pyearcal.preview import DRAFT_FONT, draft_calendar, render_proofs
+from pyearcal.year_calendar import YearCalendar
+
+
+def test_draft_keeps_font_for_titles_it_cannot_show():
+    czech = draft_calendar(YearCalendar(2026, locale=get_locale("cs")))  # "Březen"
+    assert czech.title_font_name == "DejaVu Sans"
+    assert czech.cell_font_name == DRAFT_FONT
+
+    english = draft_calendar(YearCalendar(2026, locale=get_locale("en")))
+    assert english.title_font_name == english.cell_font_name == DRAFT_FONT
+
+
+def test_proofs(picture_dir):
+    calendar = YearCalendar(2026, SortedImageDirectory(picture_dir))
+    pages = render_proofs(calendar, dpi=18)
+    assert len(pages) == 12
+    assert pages[0].size == (round(calendar.width / 4), round(calendar.height / 4))
+
+
+def test_repr_html_without_pictures():
+    assert "Calendar for year 2026" in YearCalendar(2026)._repr_html_()
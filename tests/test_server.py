@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from pyearcal.server import HTTPError, RenderServer
+
+
+@pytest.fixture
+def server(picture_dir) -> RenderServer:
+    return RenderServer(workers=1, cache_dir="unused", roots=[os.path.dirname(picture_dir)])
+
+
+def test_job_in_root(server, picture_dir):
+    job = server._check_job({"source": picture_dir, "special_days": ["2026-01-31"]})
+    assert job["source"] == os.path.realpath(picture_dir)
+    assert job["cache_dir"] == "unused"
+
+
+@pytest.mark.parametrize(
+    "job, status",
+    [
+        ({"source": "/etc"}, 403),
+        ({"source": "{root}/../.."}, 403),
+        ({"source": "{root}", "special_days": "/etc/passwd"}, 400),
+        ({"source": "{root}", "special_days": ["31. 1. 2026"]}, 400),
+        ({"source": "{root}", "font": "/usr/share/fonts/secret.ttf"}, 400),
+        ({"source": "{root}", "output": "/tmp/calendar.pdf"}, 400),
+        ({"source": "{root}", "cache_dir": "/tmp"}, 400),
+        ({"source": "{root}", "unknown": 1}, 400),
+        ({"source": "{root}", "image_dpi": 100_000}, 400),
+        ({"source": "{root}", "image_dpi": "72"}, 400),
+        ({"source": "{root}", "year": 10**9}, 400),
+        ({"source": "{root}", "year": True}, 400),
+    ],
+)
+def test_invalid_jobs(server, picture_dir, job, status):
+    job = {
+        name: value.format(root=picture_dir) if isinstance(value, str) else value
+        for name, value in job.items()
+    }
+    with pytest.raises(HTTPError) as info:
+        server._check_job(job)
+    assert info.value.status == status
+
+
+async def request(socket_path: str, method: str, path: str, job=None):
+    """Send an HTTP request over the Unix socket, return (status, body)."""
+    body = json.dumps(job).encode("utf-8") if job is not None else b""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+def test_client(picture_dir, tmp_path):
+    socket_path = os.fspath(tmp_path / "pyearcal.sock")
+    server = RenderServer(
+        workers=1, queue_size=0, cache_dir=os.fspath(tmp_path / "cache"), roots=[picture_dir]
+    )
+    job = {"source": picture_dir, "sorted": True, "year": 2026, "image_dpi": 36}
+
+    async def run():
+        serving = asyncio.create_task(server.serve(path=socket_path))
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        try:
+            status, pdf = await request(socket_path, "POST", "/render", job)
+            assert status == 200
+            assert pdf.startswith(b"%PDF")
+
+            # The only worker is busy and no request may wait for it
+            async with server._slots:
+                waiting = asyncio.create_task(request(socket_path, "POST", "/render", job))
+                while not server.pending:
+                    await asyncio.sleep(0.01)
+                status, body = await request(socket_path, "POST", "/render", job)
+                assert status == 503
+                assert json.loads(body) == {"error": "Too many requests waiting"}
+            assert (await waiting)[0] == 200
+
+            status, body = await request(socket_path, "GET", "/metrics")
+            assert status == 200
+            metrics = json.loads(body)
+            assert (metrics["completed"], metrics["failed"], metrics["rejected"]) == (2, 0, 1)
+            assert metrics["queued"] == metrics["running"] == 0
+        finally:
+            serving.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await serving
+
+    asyncio.run(run())
@@ -0,0 +1,35 @@
+import pytest
+from PIL import Image
+
+from pyearcal.smartcrop import find_crop_box
+
+
+def picture_with_detail(size, box):
+    """Plain grey picture with noise in the box."""
+    image = Image.new("RGB", size, (128, 128, 128))
+    left, upper, right, lower = box
+    image.paste(Image.effect_noise((right - left, lower - upper), 64).convert("RGB"), box)
+    return image
+
+
+@pytest.mark.parametrize(
+    "size, detail",
+    [
+        ((1200, 600), (900, 100, 1100, 300)),  # right
+        ((1200, 600), (50, 300, 250, 500)),  # left
+        ((600, 1200), (100, 0, 400, 200)),  # top
+    ],
+)
+def test_crop_box_covers_detail(size, detail):
+    left, upper, right, lower = find_crop_box(picture_with_detail(size, detail))
+    assert right - left == lower - upper == min(size)
+    assert 0 <= left and right <= size[0] and 0 <= upper and lower <= size[1]
+    assert left <= detail[0] and detail[2] <= right
+    assert upper <= detail[1] and detail[3] <= lower
+
+
+def test_crop_box_of_plain_picture_is_centered():
+    image = Image.new("RGB", (1200, 600), (128, 128, 128))
+    assert find_crop_box(image) == (300, 0, 900, 600)
+    assert find_crop_box(image, 2.0) == (0, 0, 1200, 600)
+    assert find_crop_box(image, 0.5) == (450, 0, 750, 600)
@@ -0,0 +1,119 @@
+import io
+import os
+from datetime import date
+
+import pytest
+from click.testing import CliRunner
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A6
+
+from pyearcal.cli import run
+from pyearcal.day_categories import HOLIDAY, SPECIAL_DAY, WEEKEND
+from pyearcal.image_sources import SortedImageDirectory
+from pyearcal import year_calendar
+from pyearcal.year_calendar import YearCalendar
+
+
+def test_day_categories_follow_attributes():
+    calendar = YearCalendar(2026)
+    calendar.year = 2028
+    assert calendar.day_categories.year == 2028
+    assert len(calendar._day_colors(3)) == 8  # weekends of March 2028
+    assert calendar.day_categories[date(2028, 3, 4)] == WEEKEND
+
+    calendar.special_days = [date(2028, 3, 1)]
+    assert calendar.day_categories[date(2028, 3, 1)] == SPECIAL_DAY
+    # Built once, not on each access
+    assert calendar.day_categories is calendar.day_categories
+
+    # Collections modified in place are set again
+    calendar.special_days.append(date(2028, 3, 2))
+    calendar.special_days = calendar.special_days
+    assert calendar.day_categories[date(2028, 3, 2)] == SPECIAL_DAY
+
+    calendar.holidays = [date(2028, 3, 3)]
+    assert calendar.day_categories[date(2028, 3, 3)] == HOLIDAY
+
+
+def test_peak_memory_of_one_rendering(picture_dir, tmp_path):
+    if not os.path.exists("/proc/self/clear_refs"):
+        pytest.skip("Peak memory cannot be reset here")
+    ballast = bytearray(256 * 2**20)
+    ballast[::4096] = b"x" * len(range(0, len(ballast), 4096))  # make it resident
+    del ballast
+    calendar = YearCalendar(
+        2026, SortedImageDirectory(picture_dir), pagesize=A6, measure_peak_memory=True
+    )
+    calendar.render(tmp_path / "calendar.pdf")
+    assert 0 < calendar.stats["peak_memory"] < 256 * 2**20
+
+
+def test_peak_memory_reset_is_opt_in(picture_dir, tmp_path, monkeypatch):
+    resets = []
+    monkeypatch.setattr(year_calendar, "reset_peak_memory", lambda: resets.append(True))
+    calendar = YearCalendar(2026, SortedImageDirectory(picture_dir), pagesize=A6)
+    calendar.render(tmp_path / "calendar.pdf")
+    assert resets == []
+
+    calendar.measure_peak_memory = True
+    calendar.render(tmp_path / "calendar.pdf")
+    assert resets == [True]
+
+
+@pytest.mark.parametrize("aspect_ratio", [0.5, 1.0, 1.5, 3.0])
+def test_min_picture_size_fit(aspect_ratio):
+    calendar = YearCalendar(2026, scaling="fit", image_dpi=150)
+    area = calendar.min_picture_size()
+    width, height = calendar.min_picture_size(aspect_ratio)
+    # Only one dimension needs to cover the area
+    assert (width, height) != area
+    assert width == area[0] or height == area[1]
+
+    # A photo of that size is not upscaled in any month
+    for month in range(1, 13):
+        _, target = calendar._scaling_geometry((width, height), calendar._picture_height(month))
+        assert target[0] <= width and target[1] <= height
+
+
+def test_right_sized_jpegs_are_passed_through(tmp_path, monkeypatch):
+    monkeypatch.setattr(rl_config, "useA85", 0)  # embedded images as raw bytes
+    calendar = YearCalendar(2026, image_dpi=36)
+    for month in range(1, 13):
+        _, size = calendar._scaling_geometry((1000, 1000), calendar._picture_height(month))
+        if month == 12:
+            size = (size[0] * 2, size[1])  # needs a crop
+        picture = Image.effect_noise(size, 64).convert("RGB")
+        picture.save(tmp_path / f"{month}.jpg", quality=90)
+
+    calendar.pictures = SortedImageDirectory(os.fspath(tmp_path))
+    calendar.render(tmp_path / "calendar.pdf")
+    assert calendar.stats["passthrough"] == 11
+    assert calendar.stats["scaled"] == 1
+
+    pdf = (tmp_path / "calendar.pdf").read_bytes()
+    embedded = [(tmp_path / f"{month}.jpg").read_bytes() in pdf for month in range(1, 13)]
+    assert embedded == [True] * 11 + [False]
+
+
+def test_render_to_stream(picture_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    calendar = YearCalendar(2026, SortedImageDirectory(picture_dir), image_dpi=36)
+    calendar.render(tmp_path / "calendar.pdf")
+    expected = (tmp_path / "calendar.pdf").read_bytes()
+
+    stream = io.BytesIO()
+    calendar.render(stream)
+    assert stream.getvalue() == expected
+
+    args = ["-", "-s", picture_dir, "--sorted", "-y", "2026", "--image-dpi", "36"]
+    result = CliRunner().invoke(run, args)
+    assert result.exit_code == 0, result.output
+    assert result.stdout_bytes == expected
+
+
+def test_failed_render_leaves_no_file(picture_dir, tmp_path):
+    calendar = YearCalendar(2026, {month: f"{picture_dir}/{month}.jpg" for month in range(1, 12)})
+    with pytest.raises(KeyError):
+        calendar.render(tmp_path / "calendar.pdf")
+    assert not (tmp_path / "calendar.pdf").exists()